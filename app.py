@@ -1,15 +1,16 @@
 import streamlit as st
 import os
-import tempfile
-import base64
+import re
+import threading
 import time
 import warnings
-from io import BytesIO
-from typing import Tuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import List, Tuple
 from contextlib import contextmanager
 
-# Import internal package
-from text_extractor import TextExtractor
+# Note: `text_extractor` (pdfminer, python-docx, pytesseract) is imported lazily
+# in get_extractor() so the first page load doesn't pay for it.
 
 # ==============================================================================
 # CONFIG & CONSTANTS
@@ -32,10 +33,15 @@ SUPPORTED_EXTENSIONS = {
     "txt": "text/plain",
     "md": "text/markdown"
 }
+SUPPORTED_UPLOAD_TYPES = tuple(SUPPORTED_EXTENSIONS)
 
 # Limits
 MAX_PDF_PREVIEW_SIZE_MB = 100.0
-PDF_PREVIEW_DPI = 100  # Optimized for performance
+PDF_PREVIEW_DPI = 72  # Previews are downscaled to column width anyway
+PDF_PREVIEW_HEIGHT_PX = 600
+PDF_PREVIEW_JPEG_QUALITY = 75
+PDF_PREVIEW_MAX_SIZE = (900, 1400)  # Preview column is ~600px wide
+EXTRACT_JOBS = 2  # Background extractions running at once, across sessions
 
 # Links
 AUTHOR_LINK = "https://github.com/iradukunda-fils"
@@ -77,54 +83,9 @@ CUSTOM_CSS = """
         box-shadow: 0 6px 20px rgba(255, 103, 25, 0.4);
     }
     
-    /* PDF Viewer Container */
-    .pdf-viewer-container {
-        max-height: 600px;
-        overflow-y: auto;
-        overflow-x: hidden;
-        border: 1px solid #e1e4e8;
-        border-radius: 12px;
-        padding: 24px;
-        background-color: #f3f4f6;
-        box-shadow: inset 0 2px 4px rgba(0,0,0,0.05);
-    }
-    
-    /* Scrollbar Styling */
-    .pdf-viewer-container::-webkit-scrollbar {
-        width: 10px;
-    }
-    .pdf-viewer-container::-webkit-scrollbar-track {
-        background: #f1f3f4;
-        border-radius: 10px;
-    }
-    .pdf-viewer-container::-webkit-scrollbar-thumb {
-        background: #bdc1c6;
-        border-radius: 10px;
-        border: 2px solid #f1f3f4;
-    }
-    .pdf-viewer-container::-webkit-scrollbar-thumb:hover {
-        background: #9aa0a6;
-    }
-    
-    /* PDF Page Card */
-    .page-wrapper {
-        margin-bottom: 24px;
-        background: white;
-        border-radius: 8px;
-        padding: 16px;
-        box-shadow: 0 1px 3px rgba(0,0,0,0.1), 0 1px 2px rgba(0,0,0,0.06);
-        display: flex;
-        flex-direction: column;
-        align-items: center;
-    }
-    
-    .page-wrapper:last-child {
-        margin-bottom: 0;
-    }
-    
     /* Page Label */
     .page-label {
-        align-self: flex-start;
+        display: inline-block;
         font-size: 0.75rem;
         text-transform: uppercase;
         letter-spacing: 0.5px;
@@ -142,6 +103,16 @@ CUSTOM_CSS = """
 </style>
 """
 
+def _minify_css(css: str) -> str:
+    """Strip comments and redundant whitespace from a <style> block."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{};:,>])\s*", r"\1", css).strip()
+
+# Injected on every run (Streamlit drops elements a rerun doesn't re-emit),
+# so ship the minified form
+_CSS_HTML = _minify_css(CUSTOM_CSS)
+
 # ==============================================================================
 # HELPER FUNCTIONS
 # ==============================================================================
@@ -154,29 +125,115 @@ def performance_timer(label: str, metrics: dict):
     end = time.perf_counter()
     metrics[label] = f"{end - start:.2f}s"
 
-@st.cache_data(show_spinner=False)
-def _get_pdf_images(file_bytes: bytes, dpi: int = 100) -> list:
+@st.cache_data(show_spinner=False, max_entries=8)
+def _pdf_page_count(file_id: str, _file_bytes: bytes) -> int:
+    """Return the number of pages in a PDF without rendering it, cached per upload."""
+    import pypdfium2 as pdfium
+    from text_extractor.utils import PDFIUM_LOCK
+    
+    with PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(_file_bytes)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+def _iter_pdf_pages(file_bytes: bytes, dpi: int = PDF_PREVIEW_DPI):
+    """
+    Yield grayscale page bitmaps rendered in-process with pdfium.
+    
+    Rendering happens one page at a time and needs no poppler subprocess
+    or intermediate files. Pages are scaled to fit PDF_PREVIEW_MAX_SIZE.
+    
+    pdfium is shared with background extraction and other sessions, so
+    each call into it holds PDFIUM_LOCK (never across a yield). Callers own
+    the yielded bitmaps and must close them under the same lock.
+    """
+    import pypdfium2 as pdfium
+    from text_extractor.utils import PDFIUM_LOCK
+    
+    max_width, max_height = PDF_PREVIEW_MAX_SIZE
+    with PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(file_bytes)
+        total_pages = len(pdf)
+    try:
+        for index in range(total_pages):
+            with PDFIUM_LOCK:
+                page = pdf[index]
+                try:
+                    # Render straight at the final preview size so the bitmap can be
+                    # encoded as-is, without a second resampling pass.
+                    width, height = page.get_size()
+                    scale = min(dpi / 72, max_width / width, max_height / height)
+                    bitmap = page.render(scale=scale, grayscale=True)
+                finally:
+                    page.close()
+            yield bitmap
+    finally:
+        with PDFIUM_LOCK:
+            pdf.close()
+
+@st.cache_resource
+def get_extractor():
     """
-    Convert PDF bytes to images with caching and parallel processing.
+    Load the extraction library and its PDF and OCR strategies once per
+    process, and return TextExtractor.
+    
+    The strategies import pdfminer, pypdfium2 and pytesseract lazily and
+    the registry keeps them process-wide, so warming them here moves that
+    import cost off the first extraction. TextExtractor itself is
+    stateless; its extract() is a staticmethod.
     """
-    from pdf2image import convert_from_bytes
+    from text_extractor import ExtractorRegistry, TextExtractor
     
-    cpu_count = os.cpu_count() or 2
-    threads = min(4, cpu_count)
+    for method in ('pdf_native', 'ocr'):
+        ExtractorRegistry.get_strategy(method)
+    return TextExtractor
+
+@st.cache_resource
+def _get_executor() -> ThreadPoolExecutor:
+    """Return the process-wide pool used for background extraction."""
+    from text_extractor import ExtractorRegistry
     
-    images = convert_from_bytes(
-        file_bytes, 
-        dpi=dpi,
-        fmt='jpeg',
-        thread_count=threads,
-        use_pdftocairo=True
-    )
-    return images
+    # Both jobs may OCR at once; split the cores so they don't each start
+    # a Tesseract per core
+    ExtractorRegistry.set_ocr_workers(max(1, (os.cpu_count() or 1) // EXTRACT_JOBS))
+    return ThreadPoolExecutor(max_workers=EXTRACT_JOBS)
+
+def submit_extraction(uploaded_file, ocr_mode: str, lang: str):
+    """
+    Start extracting the upload in the background and return its Future.
+    
+    The job is submitted once per (file, OCR mode, language) so it overlaps
+    with the preview rendering; reruns with unchanged settings reuse it.
+    A superseded job is cancelled: if it is already running, it exits at
+    its next page.
+    """
+    job_key = (uploaded_file.file_id, ocr_mode, lang)
+    job = st.session_state.get('extract_job')
+    if job is None or job[0] != job_key:
+        if job is not None:
+            job[1].cancel()
+            job[2].set()
+        cancelled = threading.Event()
+        # getvalue() gives the worker its own reference to the bytes, so it
+        # never shares the UploadedFile cursor with the preview.
+        future = _get_executor().submit(
+            get_extractor().extract,
+            uploaded_file.getvalue(),
+            filename=uploaded_file.name,
+            ocr_mode=ocr_mode,
+            language=lang,
+            cancel_event=cancelled
+        )
+        job = (job_key, future, cancelled)
+        st.session_state['extract_job'] = job
+    return job[1]
 
 def setup_app():
     """Initialize page config and styles."""
     st.set_page_config(**PAGE_CONFIG)
-    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+    st.markdown(_CSS_HTML, unsafe_allow_html=True)
     
     if 'text' not in st.session_state:
         st.session_state['text'] = ""
@@ -199,26 +256,26 @@ def render_sidebar() -> Tuple[str, bool, str, str]:
             help="Choose how you want to save your results."
         )
         
-        enable_ocr = st.toggle(
-            'High-Accuracy OCR', 
-            help="Enable for scanned PDFs or images. Uses Tesseract engine."
+        force_ocr = st.toggle(
+            'Force OCR (scans only)', 
+            help="Run Tesseract on every page. Leave off for normal documents: "
+                 "pages with a text layer are read natively and OCR only kicks in "
+                 "automatically for scanned PDFs and images."
         )
         
-        # Language selector - dynamically visible when OCR is enabled
-        lang = 'eng'  # Default
-        if enable_ocr:
-            languages = {
-                'English': 'eng', 
-                'French': 'fra', 
-                'Arabic': 'ara', 
-                'Spanish': 'spa'
-            }
-            selected_lang = st.selectbox(
-                'OCR Language',
-                list(languages.keys()),
-                help="Language for OCR text recognition"
-            )
-            lang = languages[selected_lang]
+        # Language selector - OCR can run in auto mode too (scans, images)
+        languages = {
+            'English': 'eng', 
+            'French': 'fra', 
+            'Arabic': 'ara', 
+            'Spanish': 'spa'
+        }
+        selected_lang = st.selectbox(
+            'OCR Language',
+            list(languages.keys()),
+            help="Language for OCR text recognition"
+        )
+        lang = languages[selected_lang]
         
         # Output filename editor - uses uploaded filename from session state
         default_name = st.session_state.get('filename', 'document')
@@ -244,7 +301,7 @@ def render_sidebar() -> Tuple[str, bool, str, str]:
             <p style="font-size: 0.8rem; margin-top: 0.5rem; color: #666;">📬 Join for engineering insights.</p>
         """, unsafe_allow_html=True)
         
-    return output_format, enable_ocr, output_filename, lang
+    return output_format, force_ocr, output_filename, lang
 
     
 def render_pdf_viewer(uploaded_file, file_size_mb: float) -> int:
@@ -254,55 +311,79 @@ def render_pdf_viewer(uploaded_file, file_size_mb: float) -> int:
         return 1
 
     try:
-        from pdf2image import pdfinfo_from_path
+        # UploadedFile shares its initial bytes, so getvalue() returns them
+        # without a copy (unlike read(), or getbuffer() which un-shares them)
+        pdf_data = uploaded_file.getvalue()
         
-        pdf_data = uploaded_file.read()
-        uploaded_file.seek(0)
+        total_pages = _pdf_page_count(uploaded_file.file_id, pdf_data)
         
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-            tmp_file.write(pdf_data)
-            tmp_path = tmp_file.name
+        st.caption(f"📄 Document: {uploaded_file.name} • {total_pages} Pages • {file_size_mb:.1f} MB")
         
-        try:
-            info = pdfinfo_from_path(tmp_path)
-            total_pages = info.get("Pages", 1)
-            
-            st.caption(f"📄 Document: {uploaded_file.name} • {total_pages} Pages • {file_size_mb:.1f} MB")
-            
-            with st.spinner(f"Rendering preview ({total_pages} pages)..."):
-                images = _get_pdf_images(pdf_data, dpi=PDF_PREVIEW_DPI)
-                _render_scrollable_images(images)
-            
-            return total_pages
-                
-        finally:
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
+        with st.spinner(f"Rendering preview ({total_pages} pages)..."):
+            _render_scrollable_images(
+                _get_pdf_preview_jpegs(uploaded_file.file_id, pdf_data, dpi=PDF_PREVIEW_DPI)
+            )
+        
+        return total_pages
                 
     except ImportError:
-        st.error("❌ `pdf2image` or `poppler` is missing. Please check server configuration.")
+        st.error("❌ `pypdfium2` is missing. Please check server configuration.")
         return 1
     except Exception as e:
         st.warning(f"⚠️ Preview unavailable: {str(e)}")
         st.info("You can still proceed with extraction.")
         return 1
 
-def _render_scrollable_images(images: list):
-    """Internal helper to render list of images in custom scroll container."""
-    pages_html = '<div class="pdf-viewer-container">'
+def _encode_page(bitmap) -> bytes:
+    """Encode a single rendered preview page to JPEG bytes."""
+    from io import BytesIO
     
-    for idx, img in enumerate(images, 1):
-        buffered = BytesIO()
-        img.save(buffered, format="JPEG", quality=85)
-        img_str = base64.b64encode(buffered.getvalue()).decode()
-        
-        # Properly escape the HTML and ensure no line breaks in img tag
-        pages_html += f'<div class="page-wrapper"><div class="page-label">Page {idx}</div>'
-        pages_html += f'<img src="data:image/jpeg;base64,{img_str}" style="width: 100%; border-radius: 4px; box-shadow: 0 0 4px rgba(0,0,0,0.1);" alt="Page {idx}">'
-        pages_html += '</div>'
-        
-    pages_html += '</div>'
-    st.markdown(pages_html, unsafe_allow_html=True)
+    buffered = BytesIO()
+    bitmap.to_pil().save(buffered, format="JPEG", quality=PDF_PREVIEW_JPEG_QUALITY, optimize=True, progressive=True)
+    return buffered.getvalue()
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _get_pdf_preview_jpegs(file_id: str, _file_bytes: bytes, dpi: int = PDF_PREVIEW_DPI) -> List[bytes]:
+    """
+    Render and JPEG-encode every preview page, cached per upload and DPI.
+    
+    Caching the compact JPEG bytes instead of decoded images keeps cache
+    entries small and lets reruns skip both rendering and encoding. The
+    cache is keyed by the upload's `file_id`; the leading underscore keeps
+    Streamlit from hashing the whole PDF on every widget interaction.
+    """
+    # Pages are rendered sequentially (pdfium is not thread-safe) and encoded
+    # in parallel batches; Pillow releases the GIL while encoding.
+    from text_extractor.utils import PDFIUM_LOCK
+    
+    pages = _iter_pdf_pages(_file_bytes, dpi=dpi)
+    workers = min(8, os.cpu_count() or 2)
+    encoded_pages = []
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while True:
+                batch = list(islice(pages, workers))
+                if not batch:
+                    break
+                try:
+                    encoded_pages.extend(executor.map(_encode_page, batch))
+                finally:
+                    # Free each bitmap's pixel buffer now rather than at GC time
+                    with PDFIUM_LOCK:
+                        for bitmap in batch:
+                            bitmap.close()
+                del batch
+    finally:
+        pages.close()
+    return encoded_pages
+
+def _render_scrollable_images(encoded_pages: List[bytes]):
+    """Internal helper to render JPEG pages in a fixed-height scroll container."""
+    with st.container(height=PDF_PREVIEW_HEIGHT_PX, border=True):
+        for idx, jpeg_bytes in enumerate(encoded_pages, 1):
+            st.markdown(f'<div class="page-label">Page {idx}</div>', unsafe_allow_html=True)
+            # Declaring the format lets Streamlit forward the bytes verbatim
+            st.image(jpeg_bytes, use_container_width=True, output_format="JPEG")
 
 def render_results_column(text: str, output_format: str, output_filename: str = "document"):
     """Render the results column."""
@@ -321,7 +402,7 @@ def render_results_column(text: str, output_format: str, output_filename: str =
     
     st.text_area("Extracted Text", text, height=500)
 
-def render_diagnostics(metrics: dict, file_size_mb: float, total_pages: int, ocr_enabled: bool):
+def render_diagnostics(metrics: dict, file_size_mb: float, total_pages: int, ocr_forced: bool):
     """Display performance insights based on execution metrics."""
     st.divider()
     with st.expander("⚡ Performance Stats & Diagnostics", expanded=False):
@@ -330,17 +411,19 @@ def render_diagnostics(metrics: dict, file_size_mb: float, total_pages: int, ocr
             st.markdown("**Execution Times**")
             if not metrics:
                 st.write("No metrics available yet.")
-            for label, duration in metrics.items():
-                st.write(f"- {label}: `{duration}`")
+            else:
+                st.markdown("\n".join(f"- {label}: `{duration}`" for label, duration in metrics.items()))
         
         with col2:
             st.markdown("**Context**")
-            st.write(f"- File Size: `{file_size_mb:.2f} MB`")
-            st.write(f"- Pages: `{total_pages}`")
-            st.write(f"- OCR Mode: `{'Enabled' if ocr_enabled else 'Auto/Disabled'}`")
+            st.markdown("\n".join([
+                f"- File Size: `{file_size_mb:.2f} MB`",
+                f"- Pages: `{total_pages}`",
+                f"- OCR Mode: `{'Forced' if ocr_forced else 'Auto'}`",
+            ]))
 
-        if ocr_enabled:
-            st.info("💡 **Note**: OCR is enabled. This significantly increases processing time (approx. 1-2s per page). Disable it for native PDFs to extract text instantly.")
+        if ocr_forced:
+            st.info("💡 **Note**: OCR is forced. This significantly increases processing time (approx. 1-2s per page). Turn it off for native PDFs to extract text instantly.")
         elif total_pages > 20:
              st.info("💡 **Tip**: For large documents, preview generation is cached. The second time you view this file, it will load instantly.")
 
@@ -350,7 +433,7 @@ def render_diagnostics(metrics: dict, file_size_mb: float, total_pages: int, ocr
 
 def main():
     setup_app()
-    output_format, enable_ocr, output_filename, lang = render_sidebar()
+    output_format, force_ocr, output_filename, lang = render_sidebar()
     
     # Header
     st.markdown("## 📑 Document Text Extractor")
@@ -359,12 +442,17 @@ def main():
     # Top Section: File Upload
     uploaded_file = st.file_uploader(
         "Upload Document", 
-        type=list(SUPPORTED_EXTENSIONS.keys()),
+        type=SUPPORTED_UPLOAD_TYPES,
         help="Supported: PDF, JPG, PNG, DOCX, TXT"
     )
     
     st.divider()
     
+    # Kick off extraction right away so it runs while the preview renders
+    extract_future = None
+    if uploaded_file:
+        extract_future = submit_extraction(uploaded_file, 'force' if force_ocr else 'auto', lang)
+    
     # Bottom Section: Two Columns (Preview | Results)
     col1, col2 = st.columns([1, 1], gap="large")
     
@@ -407,31 +495,18 @@ def main():
             # Extract Action
             if st.button("🚀 Run Extraction", type="primary", use_container_width=True):
                 try:
-                    extractor = TextExtractor()
-                    
                     with st.spinner("Processing document..."):
                         with performance_timer("Text Extraction", metrics):
-                            suffix = f".{uploaded_file.name.split('.')[-1]}"
-                            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-                                tmp_file.write(uploaded_file.getbuffer())
-                                tmp_path = tmp_file.name
-                                
-                            # Fixed API call: use ocr_mode and language (singular)
-                            results = extractor.extract(
-                                tmp_path, 
-                                ocr_mode='force' if enable_ocr else 'auto',
-                                language=lang
-                            )
-                            
-                            if os.path.exists(tmp_path):
-                                os.unlink(tmp_path)
+                            results = extract_future.result()
                             
                         st.session_state['text'] = results.full_text
                         st.session_state['filename'] = uploaded_file.name
                     
-                    render_diagnostics(metrics, file_mb, total_pages, enable_ocr)
+                    render_diagnostics(metrics, file_mb, total_pages, force_ocr)
                         
                 except Exception as e:
+                    # Drop the failed job so the next run retries it
+                    st.session_state.pop('extract_job', None)
                     st.error(f"❌ Extraction failed: {str(e)}")
                     import traceback
                     st.code(traceback.format_exc())
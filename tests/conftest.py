@@ -12,3 +12,35 @@ def dummy_pdf_bytes():
 def dummy_image_bytes():
     """Returns dummy bytes simulating an image."""
     return b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR..."
+
+@pytest.fixture
+def make_pdf_bytes():
+    """Factory building a small valid PDF with one line of text per page."""
+    def _make(pages_text):
+        objs = [
+            b"<< /Type /Catalog /Pages 2 0 R >>",
+            ("<< /Type /Pages /Kids [%s] /Count %d >>" % (
+                " ".join(f"{4 + 2 * i} 0 R" for i in range(len(pages_text))),
+                len(pages_text),
+            )).encode(),
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        ]
+        for i, text in enumerate(pages_text):
+            content = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode() if text else b""
+            objs.append(
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {5 + 2 * i} 0 R "
+                f"/Resources << /Font << /F1 3 0 R >> >> >>".encode()
+            )
+            objs.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+
+        out = b"%PDF-1.4\n"
+        offsets = []
+        for number, obj in enumerate(objs, 1):
+            offsets.append(len(out))
+            out += f"{number} 0 obj\n".encode() + obj + b"\nendobj\n"
+        xref = len(out)
+        out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode()
+        out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+        out += f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+        return out
+    return _make
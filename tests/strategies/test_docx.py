@@ -171,3 +171,16 @@ def test_docx_preserves_paragraph_order(mock_document_class):
     for i, line in enumerate(lines):
         if line:
             assert f"Paragraph {i}" == line
+
+
+@patch('text_extractor.strategies.docx.Document')
+def test_docx_keeps_trailing_empty_paragraphs(mock_document_class):
+    """Paragraphs are newline-separated exactly, including empty ones at the end."""
+    mock_doc = MagicMock()
+    texts = ["A", "", "B", "", ""]
+    mock_doc.paragraphs = [MagicMock(text=t) for t in texts]
+    mock_document_class.return_value = mock_doc
+
+    result = DocxStrategy().extract(BytesIO(b"fake docx"))
+
+    assert result.full_text == "A\n\nB\n\n"
@@ -1,76 +1,121 @@
 """Tests for OcrStrategy."""
+import os
 import pytest
 from unittest.mock import MagicMock, patch, Mock
 from io import BytesIO
+from PIL import Image
 from text_extractor.strategies.ocr import OcrStrategy
-from text_extractor.exceptions import OcrError
+from text_extractor.exceptions import ExtractionCancelled, OcrError
 
 
-@patch('text_extractor.strategies.ocr.pdfinfo_from_path')
-@patch('text_extractor.strategies.ocr.convert_from_path')
+def fake_image_to_string(image, lang, config=""):
+    """Stand-in for pytesseract: describes each image, form-feed terminated like tesseract."""
+    def describe(img):
+        if isinstance(img, str):
+            with Image.open(img) as opened:
+                return f"{opened.mode} {opened.size} {os.path.basename(img)}"
+        return f"{img.mode} {img.size}"
+
+    if isinstance(image, str) and image.endswith(".txt"):
+        with open(image, encoding="utf-8") as f:
+            return "".join(describe(path) + "\f" for path in f.read().splitlines())
+    return describe(image) + "\f"
+
+
+@patch('text_extractor.strategies.ocr.os.cpu_count', return_value=2)
 @patch('text_extractor.strategies.ocr.pytesseract')
-def test_ocr_pdf_chunked_processing(mock_tesseract, mock_convert, mock_pdfinfo):
-    """Test that OCR processes PDF in chunks."""
-    # Setup: Simulate a 12-page PDF (should process in 3 batches of 5, 5, 2)
-    mock_pdfinfo.return_value = {"Pages": 12}
-    
-    # Mock images returned by convert_from_path - need different counts per call
-    batch1 = [MagicMock() for _ in range(5)]
-    batch2 = [MagicMock() for _ in range(5)]
-    batch3 = [MagicMock() for _ in range(2)]  # Last batch is smaller
-    
-    for batch in [batch1, batch2, batch3]:
-        for img in batch:
-            img.close = MagicMock()
-    
-    # Mock returns different batches on successive calls
-    mock_convert.side_effect = [batch1, batch2, batch3]
-    mock_tesseract.image_to_string.return_value = "Page text"
-    
+def test_ocr_pdf_chunked_processing(mock_tesseract, mock_cpu_count, make_pdf_bytes):
+    """Pages are recognised several per tesseract call, split back per page."""
+    mock_tesseract.image_to_string.side_effect = fake_image_to_string
+
     strategy = OcrStrategy()
-    stream = BytesIO(b"fake pdf content")
-    
+    stream = BytesIO(make_pdf_bytes([""] * 12))
+
     result = strategy.extract(stream, language='eng')
-    
-    # Verify chunking: convert_from_path should be called 3 times
-    assert mock_convert.call_count == 3
-    
-    # Verify parallel execution setup (ThreadPoolExecutor was used)
+
+    # 12 pages over 2 workers: two tesseract runs of 6 pages each
+    assert mock_tesseract.image_to_string.call_count == 2
     assert result.metadata['page_count'] == 12
     assert len(result.pages) == 12
+    # US Letter rendered in grayscale at 150 DPI
+    assert result.pages[0].startswith("L (1275, ")
+
+
+@patch('text_extractor.strategies.ocr.os.cpu_count', return_value=16)
+@patch('text_extractor.strategies.ocr.pytesseract')
+def test_ocr_workers_caps_parallelism(mock_tesseract, mock_cpu_count, make_pdf_bytes):
+    """An explicit worker count overrides one worker per core."""
+    mock_tesseract.image_to_string.side_effect = fake_image_to_string
+
+    result = OcrStrategy(workers=2).extract(make_pdf_bytes([""] * 12), language='eng')
+
+    # 12 pages over 2 workers, not 16: two tesseract runs of 6 pages each
+    assert mock_tesseract.image_to_string.call_count == 2
+    assert len(result.pages) == 12
+
+
+@patch('text_extractor.strategies.ocr.pytesseract')
+def test_ocr_preserves_page_order(mock_tesseract, make_pdf_bytes):
+    """Threaded, batched OCR still returns pages in document order."""
+    mock_tesseract.image_to_string.side_effect = fake_image_to_string
+
+    result = OcrStrategy().extract(make_pdf_bytes([""] * 20))
+
+    assert [page.split()[-1] for page in result.pages] == [f"page-{i:05d}.pgm" for i in range(20)]
+
+
+@patch('text_extractor.strategies.ocr.pytesseract')
+def test_ocr_batch_output_mismatch_retries_per_page(mock_tesseract, make_pdf_bytes):
+    """If a batched run doesn't yield one form-feed section per page, pages are redone singly."""
+    def no_separators(image, lang, config=""):
+        return "merged" if image.endswith(".txt") else fake_image_to_string(image, lang)
+
+    mock_tesseract.image_to_string.side_effect = no_separators
+
+    with patch('text_extractor.strategies.ocr.os.cpu_count', return_value=1):
+        result = OcrStrategy().extract(make_pdf_bytes(["", "", ""]))
 
+    assert [page.split()[-1] for page in result.pages] == ["page-00000.pgm", "page-00001.pgm", "page-00002.pgm"]
 
-@patch('text_extractor.strategies.ocr.pdfinfo_from_path')
-@patch('text_extractor.strategies.ocr.Image')
-def test_ocr_fallback_to_image(mock_image, mock_pdfinfo):
+
+def test_ocr_fallback_to_image():
     """Test that OCR falls back to PIL for non-PDF images."""
-    # Simulate pdfinfo_from_path failing (not a PDF)
-    mock_pdfinfo.side_effect = Exception("Not a PDF")
-    
-    # Mock PIL Image.open
-    mock_img = MagicMock()
-    mock_img.close = MagicMock()
-    mock_image.open.return_value = mock_img
-    
-    with patch('text_extractor.strategies.ocr.pytesseract.image_to_string') as mock_tesseract:
-        mock_tesseract.return_value = "Image text content"
-        
+    png = BytesIO()
+    Image.new("RGB", (20, 10), "white").save(png, format="PNG")
+    seen = []
+
+    def record(image, lang, config=""):
+        with Image.open(image) as opened:
+            seen.append((opened.format, opened.size))
+        return "Image text content"
+
+    with patch('text_extractor.strategies.ocr.pytesseract.image_to_string', side_effect=record):
         strategy = OcrStrategy()
-        stream = BytesIO(b"fake image content")
+        stream = BytesIO(png.getvalue())
         
         result = strategy.extract(stream)
         
-        # Verify fallback to PIL
-        mock_image.open.assert_called_once()
+        # Verify fallback to PIL; tesseract gets an uncompressed copy
+        assert seen == [("PPM", (20, 10))]
         assert result.full_text == "Image text content"
         assert result.metadata['page_count'] == 1
 
 
-@patch('text_extractor.strategies.ocr.pdfinfo_from_path')
-def test_ocr_raises_error_on_failure(mock_pdfinfo):
+@pytest.mark.parametrize("mode, source_format, via_file", [("L", "JPEG", True), ("RGBA", "PNG", False)])
+def test_ocr_image_handoff_format(mode, source_format, via_file):
+    """Images PNM can hold skip pytesseract's re-encode; other modes pass through."""
+    source = BytesIO()
+    Image.new(mode, (8, 8)).save(source, format=source_format)
+
+    with patch('text_extractor.strategies.ocr.pytesseract.image_to_string', return_value="x") as mock_tesseract:
+        OcrStrategy().extract(BytesIO(source.getvalue()))
+
+    handed = mock_tesseract.call_args[0][0]
+    assert isinstance(handed, str) == via_file
+
+
+def test_ocr_raises_error_on_failure():
     """Test that OCR raises OcrError on complete failure."""
-    mock_pdfinfo.side_effect = Exception("Critical failure")
-    
     with patch('text_extractor.strategies.ocr.Image.open') as mock_img_open:
         mock_img_open.side_effect = Exception("Image open failed")
         
@@ -81,22 +126,248 @@ def test_ocr_raises_error_on_failure(mock_pdfinfo):
             strategy.extract(stream)
 
 
-@patch('text_extractor.strategies.ocr.pdfinfo_from_path')
-@patch('text_extractor.strategies.ocr.convert_from_path')
 @patch('text_extractor.strategies.ocr.pytesseract')
-def test_ocr_handles_different_languages(mock_tesseract, mock_convert, mock_pdfinfo):
+def test_ocr_handles_different_languages(mock_tesseract, make_pdf_bytes):
     """Test OCR with different language codes."""
-    mock_pdfinfo.return_value = {"Pages": 1}
-    mock_images = [MagicMock()]
-    mock_images[0].close = MagicMock()
-    mock_convert.return_value = mock_images
-    mock_tesseract.image_to_string.return_value = "Texte français"
+    mock_tesseract.image_to_string.side_effect = fake_image_to_string
     
     strategy = OcrStrategy()
-    stream = BytesIO(b"fake pdf")
+    stream = BytesIO(make_pdf_bytes([""]))
     
     result = strategy.extract(stream, language='fra')
     
     # Verify language was passed to tesseract
-    mock_tesseract.image_to_string.assert_called_with(mock_images[0], lang='fra')
+    assert mock_tesseract.image_to_string.call_args.kwargs['lang'] == 'fra'
     assert result.metadata['language'] == 'fra'
+
+
+@patch('text_extractor.strategies.ocr.pytesseract')
+def test_ocr_accepts_bytes(mock_tesseract, make_pdf_bytes):
+    """Raw bytes payloads are rendered without a temp file."""
+    mock_tesseract.image_to_string.side_effect = fake_image_to_string
+
+    result = OcrStrategy().extract(make_pdf_bytes(["", ""]))
+
+    assert len(result.pages) == 2
+
+
+@patch('text_extractor.strategies.ocr.pytesseract')
+@patch('text_extractor.strategies.ocr.tesserocr')
+def test_ocr_reuses_tesserocr_apis(mock_tesserocr, mock_tesseract, make_pdf_bytes):
+    """With tesserocr installed, API instances are pooled across pages and ended once."""
+    apis = []
+
+    def new_api(lang):
+        api = MagicMock()
+        api.GetUTF8Text.return_value = f"text ({lang})"
+        apis.append(api)
+        return api
+
+    mock_tesserocr.PyTessBaseAPI.side_effect = new_api
+
+    result = OcrStrategy().extract(make_pdf_bytes([""] * 12), language='deu')
+
+    assert result.pages == ["text (deu)"] * 12
+    mock_tesseract.image_to_string.assert_not_called()
+    # At most one API per worker thread, each released exactly once
+    assert 1 <= len(apis) <= (os.cpu_count() or 4)
+    for api in apis:
+        api.End.assert_called_once()
+
+
+@patch('text_extractor.strategies.ocr.tesserocr')
+def test_ocr_bounds_pages_in_flight(mock_tesserocr, make_pdf_bytes):
+    """Rendering never runs more than the in-flight limit ahead of recognition."""
+    import threading
+
+    release = threading.Event()
+    rendered = []
+
+    def slow_ocr():
+        release.wait(5)
+        return "text"
+
+    mock_tesserocr.PyTessBaseAPI.return_value.GetUTF8Text.side_effect = slow_ocr
+    strategy = OcrStrategy()
+    strategy.PAGES_IN_FLIGHT_PER_WORKER = 1
+
+    import pypdfium2
+    original_render = pypdfium2.PdfPage.render
+
+    def tracking_render(page, **kwargs):
+        rendered.append(1)
+        return original_render(page, **kwargs)
+
+    with patch('text_extractor.strategies.ocr.os.cpu_count', return_value=2), \
+         patch.object(pypdfium2.PdfPage, 'render', tracking_render):
+        worker = threading.Thread(target=lambda: strategy.extract(make_pdf_bytes([""] * 6)))
+        worker.start()
+        worker.join(0.5)
+        in_flight_while_blocked = len(rendered)
+        release.set()
+        worker.join(5)
+
+    assert in_flight_while_blocked == 2
+    assert len(rendered) == 6
+
+
+@patch('text_extractor.strategies.ocr.pytesseract')
+def test_ocr_page_failure_raises_ocr_error(mock_tesseract, make_pdf_bytes):
+    """A failing page aborts the extraction with OcrError."""
+    mock_tesseract.image_to_string.side_effect = RuntimeError("tesseract crashed")
+
+    with pytest.raises(OcrError):
+        OcrStrategy().extract(make_pdf_bytes([""] * 4))
+
+
+@patch('text_extractor.strategies.ocr.pytesseract')
+def test_ocr_binarize_applies_adaptive_threshold(mock_tesseract, make_pdf_bytes):
+    """With binarize=True, pages reach tesseract thresholded by OpenCV."""
+    import numpy as np
+    mock_tesseract.image_to_string.side_effect = fake_image_to_string
+    fake_cv2 = MagicMock()
+    fake_cv2.adaptiveThreshold.side_effect = lambda src, *args: np.full(src.shape, 255, dtype=np.uint8)
+
+    with patch('text_extractor.strategies.ocr.cv2', fake_cv2), \
+            patch('text_extractor.strategies.ocr.np', np, create=True):
+        result = OcrStrategy(binarize=True).extract(make_pdf_bytes(["", ""]))
+
+    assert fake_cv2.adaptiveThreshold.call_count == 2
+    assert fake_cv2.adaptiveThreshold.call_args[0][0].shape[1] == 1275
+    assert len(result.pages) == 2
+
+
+def test_ocr_binarize_without_opencv_is_disabled():
+    """Requesting binarisation without OpenCV warns and leaves images untouched."""
+    with patch('text_extractor.strategies.ocr.cv2', None):
+        strategy = OcrStrategy(binarize=True)
+
+    assert strategy.binarize is False
+
+
+@patch('text_extractor.strategies.ocr.pytesseract')
+def test_ocr_skips_pages_with_text_layer(mock_tesseract, make_pdf_bytes):
+    """Pages with enough native text are taken as-is; only the rest are OCR'd."""
+    mock_tesseract.image_to_string.side_effect = fake_image_to_string
+    pdf = make_pdf_bytes(["", "Native page text", "", "More native text"])
+
+    with patch('text_extractor.strategies.ocr.os.cpu_count', return_value=1):
+        result = OcrStrategy(native_text_min_chars=5).extract(pdf)
+
+    assert result.pages[1].strip() == "Native page text"
+    assert result.pages[3].strip() == "More native text"
+    assert result.pages[0].split()[-1] == "page-00000.pgm"
+    assert result.pages[2].split()[-1] == "page-00002.pgm"
+    assert result.metadata['native_text_pages'] == 2
+    # The two image pages went to tesseract together
+    assert mock_tesseract.image_to_string.call_count == 1
+
+    # 0 disables the check: every page is OCR'd
+    result = OcrStrategy(native_text_min_chars=0).extract(pdf)
+    assert result.metadata['native_text_pages'] == 0
+    assert all(page.startswith("L ") for page in result.pages)
+
+
+@patch('text_extractor.strategies.ocr.tesserocr')
+def test_ocr_skips_text_layer_pages_with_tesserocr(mock_tesserocr, make_pdf_bytes):
+    """The in-process recogniser path skips text-layer pages too."""
+    api = mock_tesserocr.PyTessBaseAPI.return_value
+    api.GetUTF8Text.return_value = "ocr"
+
+    result = OcrStrategy(native_text_min_chars=5).extract(make_pdf_bytes(["Native page text", ""]))
+
+    assert [page.strip() for page in result.pages] == ["Native page text", "ocr"]
+    assert api.SetImage.call_count == 1
+
+
+@patch('text_extractor.strategies.ocr.pytesseract')
+def test_ocr_passes_engine_and_segmentation_modes(mock_tesseract, make_pdf_bytes):
+    """oem/psm reach the tesseract CLI as flags; unset, no flags are added."""
+    mock_tesseract.image_to_string.side_effect = fake_image_to_string
+
+    OcrStrategy(oem=1, psm=6).extract(make_pdf_bytes(["", ""]))
+    assert mock_tesseract.image_to_string.call_args.kwargs['config'] == "--oem 1 --psm 6"
+
+    OcrStrategy().extract(make_pdf_bytes([""]))
+    assert mock_tesseract.image_to_string.call_args.kwargs['config'] == ""
+
+
+@patch('text_extractor.strategies.ocr.tesserocr')
+def test_ocr_passes_modes_to_tesserocr(mock_tesserocr, make_pdf_bytes):
+    """oem/psm are forwarded to the pooled tesserocr APIs."""
+    mock_tesserocr.PyTessBaseAPI.return_value.GetUTF8Text.return_value = "ocr"
+
+    OcrStrategy(oem=1).extract(make_pdf_bytes([""]))
+
+    mock_tesserocr.PyTessBaseAPI.assert_called_once_with(lang='eng', oem=1)
+
+
+@patch('text_extractor.strategies.ocr.os.cpu_count', return_value=1)
+@patch('text_extractor.strategies.ocr.tesserocr')
+def test_ocr_iter_pages_streams_results(mock_tesserocr, mock_cpu_count, make_pdf_bytes):
+    """iter_pages yields each page once recognised, before later pages are done."""
+    api = mock_tesserocr.PyTessBaseAPI.return_value
+    api.GetUTF8Text.side_effect = lambda: f"text {api.SetImage.call_count}"
+
+    pages = OcrStrategy().iter_pages(make_pdf_bytes([""] * 6))
+    assert next(pages) == (0, "text 1")
+    assert api.SetImage.call_count < 6
+
+    pages.close()  # Early stop: pending pages are dropped
+    assert api.SetImage.call_count < 6
+    api.End.assert_called_once()
+
+
+@patch('text_extractor.strategies.ocr.pytesseract')
+def test_ocr_iter_pages_matches_extract(mock_tesseract, make_pdf_bytes):
+    mock_tesseract.image_to_string.side_effect = fake_image_to_string
+    pdf = make_pdf_bytes([""] * 5)
+
+    streamed = list(OcrStrategy().iter_pages(pdf))
+
+    assert [index for index, _ in streamed] == list(range(5))
+    assert [text for _, text in streamed] == OcrStrategy().extract(pdf).pages
+
+
+@patch('text_extractor.strategies.ocr.os.cpu_count', return_value=1)
+@patch('text_extractor.strategies.ocr.tesserocr')
+def test_ocr_extract_stops_when_cancelled(mock_tesserocr, mock_cpu_count, make_pdf_bytes):
+    """Setting the cancel event stops OCR at the next page."""
+    import threading
+    cancel = threading.Event()
+    api = mock_tesserocr.PyTessBaseAPI.return_value
+
+    def recognise():
+        cancel.set()
+        return "text"
+    api.GetUTF8Text.side_effect = recognise
+
+    with pytest.raises(ExtractionCancelled):
+        OcrStrategy().extract(make_pdf_bytes([""] * 6), cancel_event=cancel)
+    assert api.SetImage.call_count < 6
+    api.End.assert_called_once()
+
+
+def test_ocr_iter_pages_raises_ocr_error():
+    with pytest.raises(OcrError):
+        list(OcrStrategy().iter_pages(b"not a pdf or image"))
+
+
+@patch('text_extractor.strategies.ocr.pytesseract')
+def test_ocr_waits_for_pdfium_lock(mock_tesseract, make_pdf_bytes):
+    """pdfium is only touched while holding the process-wide lock."""
+    import threading
+    from text_extractor.utils import PDFIUM_LOCK
+    mock_tesseract.image_to_string.side_effect = fake_image_to_string
+    results = []
+
+    with PDFIUM_LOCK:
+        worker = threading.Thread(target=lambda: results.append(OcrStrategy().extract(make_pdf_bytes([""]))))
+        worker.start()
+        worker.join(timeout=0.5)
+        # Blocked on the lock: nothing was opened or rendered yet
+        assert worker.is_alive()
+        assert mock_tesseract.image_to_string.call_count == 0
+
+    worker.join(timeout=10)
+    assert results[0].metadata['page_count'] == 1
@@ -40,3 +40,106 @@ def test_pdf_extract_success(mock_pdf_page, mock_extract_to_fp):
         
         assert "Extracted Text from page" in result.full_text
         assert result.metadata['method'] == 'native_pdf'
+
+
+def test_pdf_extract_splits_pages(make_pdf_bytes):
+    """Each page's text lands in its own entry even though the buffer is reused."""
+    pdf_bytes = make_pdf_bytes(["Alpha page text", "Beta page text", "Gamma page text"])
+
+    result = PdfNativeStrategy().extract(pdf_bytes)
+
+    assert [page.strip() for page in result.pages] == ["Alpha page text", "Beta page text", "Gamma page text"]
+    assert result.full_text == "\n\n".join(result.pages)
+
+
+def test_pdf_fast_path_uses_pdfium(make_pdf_bytes):
+    """fast=True reads the text layer with pdfium and matches pdfminer's page split."""
+    pdf_bytes = make_pdf_bytes(["Alpha page text with enough characters", "Beta page text with enough characters"])
+
+    result = PdfNativeStrategy(fast=True).extract(pdf_bytes)
+
+    assert result.metadata['engine'] == 'pdfium'
+    assert result.pages == ["Alpha page text with enough characters", "Beta page text with enough characters"]
+
+
+def test_pdf_fast_path_falls_back_to_pdfminer(make_pdf_bytes):
+    """Too little text from pdfium hands the file to pdfminer."""
+    result = PdfNativeStrategy(fast=True).extract(make_pdf_bytes(["Short"]))
+
+    assert 'engine' not in result.metadata
+    assert result.pages[0].strip() == "Short"
+
+
+@patch('text_extractor.strategies.pdf.os.cpu_count', return_value=2)
+def test_pdf_parallel_extraction_matches_serial(mock_cpu_count, make_pdf_bytes):
+    """Large documents are split across processes with pages kept in order."""
+    pdf_bytes = make_pdf_bytes([f"Page number {i}" for i in range(5)])
+    serial = PdfNativeStrategy().extract(pdf_bytes)
+
+    strategy = PdfNativeStrategy(parallel=True)
+    strategy.PARALLEL_MIN_PAGES = 2
+    with patch('text_extractor.strategies.pdf._extract_pages', wraps=None) as spy:
+        spy.side_effect = AssertionError("serial path should not run")
+        parallel = strategy.extract(pdf_bytes)
+
+    assert parallel.pages == serial.pages
+    assert parallel.metadata['page_count'] == 5
+
+
+@patch('text_extractor.strategies.pdf.os.cpu_count', return_value=4)
+@patch('text_extractor.strategies.pdf.ProcessPoolExecutor')
+def test_pdf_parallel_extraction_is_opt_in(mock_pool, mock_cpu_count, make_pdf_bytes):
+    """Without parallel=True no worker processes are started, however long the PDF."""
+    strategy = PdfNativeStrategy()
+    strategy.PARALLEL_MIN_PAGES = 2
+
+    result = strategy.extract(make_pdf_bytes([f"Page number {i}" for i in range(5)]))
+
+    mock_pool.assert_not_called()
+    assert result.metadata['page_count'] == 5
+
+
+@patch('text_extractor.strategies.pdf.os.cpu_count', return_value=2)
+def test_pdf_parallel_workers_use_strategy_laparams(mock_cpu_count, make_pdf_bytes):
+    """Worker ranges come from pdfminer's page count and carry the strategy's LAParams."""
+    strategy = PdfNativeStrategy(parallel=True)
+    strategy.PARALLEL_MIN_PAGES = 2
+    submitted = []
+
+    class InlinePool:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def submit(self, fn, *args):
+            submitted.append(args)
+            future = MagicMock()
+            future.result.return_value = fn(*args)
+            return future
+
+    with patch('text_extractor.strategies.pdf.ProcessPoolExecutor', InlinePool):
+        result = strategy.extract(make_pdf_bytes([f"Page number {i}" for i in range(5)]))
+
+    assert [(start, end) for _, start, end, _ in submitted] == [(0, 3), (3, 5)]
+    assert all(laparams is strategy.laparams for *_, laparams in submitted)
+    assert [page.strip() for page in result.pages] == [f"Page number {i}" for i in range(5)]
+
+
+def test_pdf_documents_do_not_share_fonts(make_pdf_bytes):
+    """One strategy instance must not reuse fonts across files with clashing object ids."""
+    plain = make_pdf_bytes(["AAA"])
+    # Same font object id, but this font's encoding maps code 65 to "B"
+    remapped = make_pdf_bytes(["AAA"]).replace(
+        b"/BaseFont /Helvetica >>",
+        b"/BaseFont /Helvetica /Encoding << /Differences [65 /B] >> >>",
+    )
+    strategy = PdfNativeStrategy()
+
+    assert strategy.extract(plain).pages[0].strip() == "AAA"
+    assert strategy.extract(remapped).pages[0].strip() == "BBB"
+    assert strategy.extract(plain).pages[0].strip() == "AAA"
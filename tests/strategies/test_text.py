@@ -2,6 +2,9 @@
 import pytest
 from unittest.mock import MagicMock, patch
 from io import BytesIO
+import io
+import mmap
+import os
 from text_extractor.strategies.text import RawTextStrategy
 
 
@@ -32,8 +35,8 @@ def test_text_extract_utf8():
     assert "مرحبا بالعالم" in result.full_text
 
 
-def test_text_extract_latin1_fallback():
-    """Test fallback to latin-1 for non-UTF8 content."""
+def test_text_extract_invalid_utf8_replaced():
+    """Test that invalid UTF-8 bytes are replaced instead of failing."""
     strategy = RawTextStrategy()
     # Create content with latin-1 specific characters
     content = b"\xc0\xe9\xf1"  # Characters that aren't valid UTF-8
@@ -42,8 +45,19 @@ def test_text_extract_latin1_fallback():
     # Should not raise an error
     result = strategy.extract(stream)
     
-    # Should have some text (decoded as latin-1)
+    # Invalid bytes become replacement characters
     assert len(result.full_text) > 0
+    assert "\ufffd" in result.full_text
+
+
+def test_text_extract_keeps_utf8_around_invalid_bytes():
+    """Test that valid multibyte text survives a stray invalid byte."""
+    strategy = RawTextStrategy()
+    content = "Café ".encode('utf-8') + b"\xff" + " naïve".encode('utf-8')
+    
+    result = strategy.extract(BytesIO(content))
+    
+    assert result.full_text == "Café \ufffd naïve"
 
 
 def test_text_extract_large_file():
@@ -131,3 +145,138 @@ def test_text_extract_logs_large_file_warning(mock_logger):
     warning_calls = [call for call in mock_logger.warning.call_args_list 
                      if 'Large text file detected' in str(call)]
     assert len(warning_calls) > 0
+
+
+def test_text_extract_from_file_stream(tmp_path):
+    """Test chunked reading from a real file spanning several chunks."""
+    strategy = RawTextStrategy()
+    content = ("Line of text\n" * 200000).encode('utf-8')  # ~2.6MB
+    path = tmp_path / "big.txt"
+    path.write_bytes(content)
+    
+    with open(path, "rb") as stream:
+        stream.read(10)  # Cursor away from the start
+        result = strategy.extract(stream)
+    
+    assert result.full_text == content.decode('utf-8')
+
+
+def test_text_extract_large_stream_decodes_incrementally(tmp_path):
+    """Multi-byte characters split across chunk boundaries survive streaming decode."""
+    strategy = RawTextStrategy()
+    strategy.LARGE_FILE_BYTES = 0
+    strategy.CHUNK_SIZE = 7  # Forces splits inside 2- and 4-byte sequences
+    content = "héllo wörld 🌍 " * 50
+    # A stream with no file descriptor to map
+    stream = io.BufferedReader(BytesIO(content.encode('utf-8')))
+
+    result = strategy.extract(stream)
+
+    assert result.full_text == content
+
+
+def test_text_extract_from_bytearray_and_memoryview():
+    """Bytes-like payloads are decoded directly without wrapping."""
+    strategy = RawTextStrategy()
+    payload = "héllo".encode('utf-8')
+
+    assert strategy.extract(bytearray(payload)).full_text == "héllo"
+
+    view = memoryview(payload)
+    assert strategy.extract(view).full_text == "héllo"
+    # The caller's view is not released by the strategy
+    assert view.tobytes() == payload
+
+
+def test_text_extract_size_hint_mismatch(tmp_path):
+    """A stale size hint (file shrank or grew) still yields the actual content."""
+    strategy = RawTextStrategy()
+    path = tmp_path / "notes.txt"
+    path.write_bytes(b"actual content")
+
+    for hint in (4, 1000):
+        with patch('text_extractor.strategies.text.stream_size', return_value=hint):
+            with open(path, "rb") as stream:
+                assert strategy.extract(stream).full_text == "actual content"
+
+
+def test_text_extract_from_unseekable_stream():
+    """Streams of unknown size (e.g. pipes) are decoded incrementally."""
+    strategy = RawTextStrategy()
+    strategy.CHUNK_SIZE = 3  # Splits the multi-byte characters
+    content = "pipé 🌍 data"
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, content.encode('utf-8'))
+    os.close(write_fd)
+
+    with os.fdopen(read_fd, "rb") as stream:
+        assert not stream.seekable()
+        result = strategy.extract(stream)
+
+    assert result.full_text == content
+
+
+def test_text_extract_maps_regular_files(tmp_path):
+    """Regular files are decoded from a read-only mapping, closed afterwards."""
+    strategy = RawTextStrategy()
+    path = tmp_path / "mapped.txt"
+    path.write_bytes("mäpped text".encode('utf-8'))
+    read_from = []
+    read_bytes = strategy._read_bytes
+
+    def spy(file_stream, size=None):
+        read_from.append(file_stream)
+        return read_bytes(file_stream, size)
+
+    with patch.object(strategy, '_read_bytes', side_effect=spy):
+        with open(path, "rb") as stream:
+            result = strategy.extract(stream)
+
+    assert result.full_text == "mäpped text"
+    assert isinstance(read_from[0], mmap.mmap)
+    assert read_from[0].closed
+
+
+def test_text_extract_large_mapped_file_decoded_in_one_pass(tmp_path):
+    """Large files with a descriptor skip the chunk-and-join decode."""
+    strategy = RawTextStrategy()
+    strategy.LARGE_FILE_BYTES = 0
+    content = "héllo wörld 🌍 " * 50
+    path = tmp_path / "big.txt"
+    path.write_bytes(content.encode('utf-8'))
+
+    with patch.object(strategy, '_decode_chunks') as decode_chunks:
+        with open(path, "rb") as stream:
+            result = strategy.extract(stream)
+
+    decode_chunks.assert_not_called()
+    assert result.full_text == content
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "utf-16-le", "utf-16-be", "utf-32-le", "utf-32-be"])
+def test_text_extract_detects_bom(encoding):
+    """A byte order mark selects the codec and is not part of the text."""
+    content = "Ünïcode tëxt 🌍\nline two"
+    payload = "\ufeff".encode(encoding) + content.encode(encoding)
+    strategy = RawTextStrategy()
+
+    assert strategy.extract(BytesIO(payload)).full_text == content
+
+    # Streaming decode, with chunks that split code units
+    strategy.LARGE_FILE_BYTES = 0
+    strategy.CHUNK_SIZE = 5
+    stream = io.BufferedReader(BytesIO(payload))
+    assert strategy.extract(stream).full_text == content
+
+
+def test_text_read_bytes_does_not_copy_in_memory_input():
+    """Bytes-like input goes through the single read path without being copied."""
+    strategy = RawTextStrategy()
+    payload = b"in memory" * 1000
+
+    assert strategy._read_bytes(payload) is payload
+    assert strategy._read_bytes(BytesIO(payload)) is payload
+    buf = bytearray(payload)
+    assert strategy._read_bytes(buf) is buf
+    with strategy._read_bytes(memoryview(buf)) as view:
+        assert view.obj is buf
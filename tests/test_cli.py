@@ -126,3 +126,61 @@ def test_cli_verbose_logging(mock_extract):
     # Verify logging was configured with INFO level
     call_args = mock_logging.call_args
     assert call_args[1]['level'] == logging.INFO
+
+
+@patch('text_extractor.__main__.extract_text')
+def test_main_accepts_argv_and_reuses_parser(mock_extract):
+    """main() can be driven in a loop without rebuilding the parser."""
+    from text_extractor.__main__ import _build_parser
+
+    mock_extract.return_value = MagicMock(full_text="Text")
+
+    with patch('text_extractor.__main__.Path.exists', return_value=True):
+        with patch('builtins.print'):
+            main(['a.pdf'])
+            main(['b.pdf', '--ocr'])
+
+    assert mock_extract.call_count == 2
+    assert mock_extract.call_args.kwargs['ocr_mode'] == 'force'
+    assert _build_parser() is _build_parser()
+
+
+@patch('text_extractor.__main__.extract_text')
+def test_cli_output_file_matches_full_text(mock_extract, tmp_path):
+    """Multi-page output is written page by page with the full_text separators."""
+    pages = ["Page one", "Page two", "Page three"]
+    mock_extract.return_value = ExtractionResult(
+        full_text="\n\n".join(pages), pages=pages, metadata={}
+    )
+    output_path = tmp_path / "out.txt"
+
+    with patch('text_extractor.__main__.Path.exists', return_value=True):
+        main(['test.pdf', '--output', str(output_path)])
+
+    assert output_path.read_text(encoding="utf-8") == "\n\n".join(pages)
+
+
+@patch('text_extractor.__main__.extract_text')
+def test_cli_multiple_files_to_output_dir(mock_extract, tmp_path):
+    """Several inputs are written to <output>/<name>.txt, continuing past failures."""
+    inputs = []
+    for name in ("a.pdf", "bad.pdf", "a.docx"):
+        path = tmp_path / name
+        path.write_bytes(b"x")
+        inputs.append(str(path))
+
+    def fake_extract(input_data, filename, ocr_mode, language):
+        if filename == "bad.pdf":
+            raise RuntimeError("boom")
+        return ExtractionResult(full_text=filename, pages=[filename], metadata={})
+
+    mock_extract.side_effect = fake_extract
+    out_dir = tmp_path / "out"
+
+    with pytest.raises(SystemExit) as exc_info:
+        main(inputs + ['--output', str(out_dir), '--jobs', '1'])
+
+    assert exc_info.value.code == 1
+    assert (out_dir / "a.pdf.txt").read_text(encoding="utf-8") == "a.pdf"
+    assert (out_dir / "a.docx.txt").read_text(encoding="utf-8") == "a.docx"
+    assert not (out_dir / "bad.pdf.txt").exists()
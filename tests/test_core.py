@@ -2,6 +2,7 @@ import pytest
 from unittest.mock import MagicMock, patch
 from text_extractor.core import extract, TextExtractor
 from text_extractor.strategies.base import ExtractionResult
+from text_extractor.strategies.pdf import PdfNativeStrategy
 
 @patch('text_extractor.core.ExtractorRegistry')
 def test_extract_calls_strategy_correctly(mock_registry):
@@ -41,8 +42,7 @@ def test_extract_invalid_input_type():
 def test_smart_fallback_to_ocr(mock_registry):
     """Test that core automatically falls back to OCR for scanned PDFs."""
     # Setup: Native PDF extraction returns very little text
-    mock_pdf_strategy = MagicMock()
-    mock_pdf_strategy.__class__.__name__ = 'PdfNativeStrategy'
+    mock_pdf_strategy = MagicMock(spec=PdfNativeStrategy)
     
     # Simulate a scanned PDF (native extraction yields almost nothing)
     scanned_result = ExtractionResult(
@@ -72,3 +72,107 @@ def test_smart_fallback_to_ocr(mock_registry):
     mock_registry.get_strategy.assert_called_once_with('ocr')
     assert result.metadata.get('fallback_triggered') == True
     assert result.full_text == "Scanned document content"
+
+@patch('text_extractor.core.ExtractorRegistry')
+def test_extract_passes_bytes_without_wrapping(mock_registry):
+    mock_strategy = MagicMock()
+    mock_registry.auto_select_strategy.return_value = mock_strategy
+    mock_strategy.extract.return_value = ExtractionResult(full_text="ok", pages=["ok"], metadata={})
+
+    payload = b"raw text payload"
+    extract(payload, filename="notes.txt")
+
+    # The strategy receives the original bytes object, not a BytesIO copy
+    assert mock_strategy.extract.call_args[0][0] is payload
+
+
+def test_extract_large_path_is_memory_mapped(tmp_path):
+    path = tmp_path / "big.txt"
+    path.write_text("héllo wörld\n" * 10, encoding="utf-8")
+
+    with patch("text_extractor.core.MMAP_THRESHOLD_BYTES", 0):
+        result = extract(path)
+
+    assert result.full_text == "héllo wörld\n" * 10
+
+
+def test_count_nonspace_stops_at_limit():
+    from text_extractor.core import _count_nonspace
+
+    assert _count_nonspace("  a b\n\tc  ", 50) == 3
+    assert _count_nonspace("x" * 1000, 50) == 50
+
+
+def test_extract_accepts_bytearray_and_memoryview():
+    data = b"plain text payload"
+
+    assert extract(bytearray(data), filename="a.txt").full_text == "plain text payload"
+    assert extract(memoryview(data), filename="a.txt").full_text == "plain text payload"
+
+
+@patch('text_extractor.core.ExtractorRegistry')
+def test_no_fallback_for_non_pdf_strategy(mock_registry):
+    """Only the native PDF strategy triggers the OCR fallback."""
+    mock_strategy = MagicMock()
+    mock_strategy.__class__.__name__ = 'NotPdfNativeStrategy'
+    mock_strategy.extract.return_value = ExtractionResult(
+        full_text="", pages=[""], metadata={"page_count": 1}
+    )
+    mock_registry.auto_select_strategy.return_value = mock_strategy
+
+    extract(b"data", filename="empty.txt", ocr_mode='auto')
+
+    mock_registry.get_strategy.assert_not_called()
+
+
+@patch('text_extractor.core.ExtractorRegistry')
+def test_smart_fallback_for_extensionless_pdf(mock_registry):
+    """Unknown extensions are parsed as PDF, so they can still fall back to OCR."""
+    mock_pdf_strategy = MagicMock(spec=PdfNativeStrategy)
+    mock_pdf_strategy.extract.return_value = ExtractionResult(
+        full_text="", pages=[""], metadata={"page_count": 1}
+    )
+    mock_ocr_strategy = MagicMock()
+    mock_ocr_strategy.extract.return_value = ExtractionResult(
+        full_text="OCR text", pages=["OCR text"], metadata={}
+    )
+    mock_registry.auto_select_strategy.return_value = mock_pdf_strategy
+    mock_registry.get_strategy.return_value = mock_ocr_strategy
+
+    result = extract(b"%PDF-1.4", filename="download", ocr_mode='auto')
+
+    assert result.metadata.get('fallback_triggered') is True
+
+
+def test_count_nonspace_looks_past_blank_head():
+    from text_extractor.core import _count_nonspace
+
+    text = " \n" * 5000 + "y" * 60
+    assert _count_nonspace(text, 50) == 50
+    assert _count_nonspace("　" * 10 + "z", 50) == 1
+
+
+@patch('text_extractor.strategies.ocr.pytesseract')
+def test_force_ocr_recognises_text_layer_pages(mock_tesseract, make_pdf_bytes):
+    """ocr_mode='force' runs Tesseract even on pages that have a text layer."""
+    mock_tesseract.image_to_string.return_value = "recognised\f"
+    pdf = make_pdf_bytes(["A text layer with well over a hundred characters " * 3])
+
+    result = extract(pdf, filename="doc.pdf", ocr_mode='force')
+
+    assert mock_tesseract.image_to_string.call_count == 1
+    assert result.metadata['native_text_pages'] == 0
+    assert result.pages == ["recognised"]
+
+
+@patch('text_extractor.strategies.ocr.pytesseract')
+def test_cancel_event_stops_ocr_fallback(mock_tesseract, make_pdf_bytes):
+    """The cancel event reaches the OCR run of the scanned-PDF fallback."""
+    import threading
+    from text_extractor.exceptions import ExtractionCancelled
+    cancel = threading.Event()
+    cancel.set()
+    mock_tesseract.image_to_string.return_value = "recognised\f"
+
+    with pytest.raises(ExtractionCancelled):
+        extract(make_pdf_bytes(["", ""]), filename="scan.pdf", cancel_event=cancel)
@@ -19,8 +19,51 @@ def test_registry_force_ocr():
     # Even with a PDF extension, should return OCR if enabled
     strategy = ExtractorRegistry.auto_select_strategy("document.pdf", enable_ocr=True)
     assert isinstance(strategy, OcrStrategy)
+    # Forced OCR recognises every page instead of reusing text layers
+    assert strategy.native_text_min_chars == 0
+    assert ExtractorRegistry.get_strategy('ocr').native_text_min_chars > 0
 
 def test_registry_unknown_extension_fallback():
     # Should fallback to PDF Native for unknown types
     strategy = ExtractorRegistry.auto_select_strategy("unknown_file.xyz")
     assert isinstance(strategy, PdfNativeStrategy)
+
+def test_registry_auto_select_is_case_insensitive():
+    strategy = ExtractorRegistry.auto_select_strategy("SCAN.JPEG")
+    assert isinstance(strategy, OcrStrategy)
+
+def test_registry_auto_select_text_and_docx():
+    from text_extractor.strategies.text import RawTextStrategy
+    from text_extractor.strategies.docx import DocxStrategy
+    assert isinstance(ExtractorRegistry.auto_select_strategy("notes.md"), RawTextStrategy)
+    assert isinstance(ExtractorRegistry.auto_select_strategy("report.docx"), DocxStrategy)
+
+def test_registry_get_strategy_reuses_instance():
+    assert ExtractorRegistry.get_strategy('raw_text') is ExtractorRegistry.get_strategy('raw_text')
+
+def test_registry_get_strategy_unknown_method():
+    from text_extractor.exceptions import UnsupportedFileTypeError
+    with pytest.raises(UnsupportedFileTypeError):
+        ExtractorRegistry.get_strategy('nope')
+
+def test_registry_pdf_fast_strategy():
+    fast = ExtractorRegistry.get_strategy('pdf_fast')
+    assert isinstance(fast, PdfNativeStrategy)
+    assert fast.fast is True
+    assert ExtractorRegistry.get_strategy('pdf_native').fast is False
+
+def test_registry_pdf_parallel_strategy():
+    parallel = ExtractorRegistry.get_strategy('pdf_parallel')
+    assert isinstance(parallel, PdfNativeStrategy)
+    assert parallel.parallel is True
+    assert ExtractorRegistry.get_strategy('pdf_native').parallel is False
+
+def test_registry_set_ocr_workers():
+    ocr = ExtractorRegistry.get_strategy('ocr')
+    try:
+        ExtractorRegistry.set_ocr_workers(3)
+        assert ocr.workers == 3
+        assert ExtractorRegistry.get_strategy('ocr_all_pages').workers == 3
+    finally:
+        ExtractorRegistry.set_ocr_workers(None)
+    assert ocr.workers is None
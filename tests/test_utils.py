@@ -0,0 +1,96 @@
+"""Tests for shared stream helpers."""
+from io import BytesIO
+from unittest.mock import patch
+from text_extractor.utils import ensure_stream, open_pdf_document, stream_size
+
+
+def test_ensure_stream_wraps_bytes():
+    stream = ensure_stream(b"payload")
+    
+    assert isinstance(stream, BytesIO)
+    assert stream.read() == b"payload"
+
+
+def test_ensure_stream_passes_streams_through():
+    original = BytesIO(b"payload")
+    
+    assert ensure_stream(original) is original
+
+
+def test_stream_size_does_not_move_position(tmp_path):
+    buf = BytesIO(b"0123456789")
+    buf.seek(4)
+    assert stream_size(buf) == 10
+    assert buf.tell() == 4
+
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"x" * 42)
+    with open(path, "rb") as f:
+        f.read(5)
+        assert stream_size(f) == 42
+        assert f.tell() == 5
+
+
+def test_stream_size_keeps_bytesio_buffer_shared():
+    data = b"x" * (1024 * 1024)
+    buf = BytesIO(data)
+
+    assert stream_size(buf) == len(data)
+    # Still sharing the original bytes: sizing made no copy
+    assert buf.getvalue() is data
+
+
+def test_stream_size_bytes_and_unknown():
+    assert stream_size(b"abc") == 3
+    assert stream_size(object()) is None
+
+
+def test_ensure_stream_wraps_bytes_likes():
+    assert ensure_stream(bytearray(b"ab")).read() == b"ab"
+    assert ensure_stream(memoryview(b"cd")).read() == b"cd"
+
+
+def test_open_pdf_document_reads_small_streams_into_memory(tmp_path, make_pdf_bytes):
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(make_pdf_bytes(["one", "two"]))
+
+    with patch('pypdfium2.PdfDocument') as document:
+        with open(path, "rb") as stream:
+            stream.read(5)  # Cursor away from the start
+            open_pdf_document(stream)
+        assert document.call_args[0][0] == path.read_bytes()
+
+        with patch('text_extractor.utils.IN_MEMORY_PDF_BYTES', 10):
+            with open(path, "rb") as stream:
+                open_pdf_document(stream)
+                # Too large: pdfium reads the stream lazily
+                assert document.call_args[0][0] is stream
+
+    with open(path, "rb") as stream:
+        pdf = open_pdf_document(stream)
+    assert len(pdf) == 2
+    pdf.close()
+
+
+def test_open_pdf_document_reads_large_mmaps_lazily(tmp_path, make_pdf_bytes):
+    import mmap
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(make_pdf_bytes(["one", "two", "three"]))
+
+    with open(path, "rb") as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        with patch('text_extractor.utils.IN_MEMORY_PDF_BYTES', 10):
+            with patch('pypdfium2.PdfDocument') as document:
+                open_pdf_document(mapping)
+            # Too large: pdfium gets a reader over the mapping, not a copy
+            assert not isinstance(document.call_args[0][0], bytes)
+
+            pdf = open_pdf_document(mapping)
+            assert len(pdf) == 3
+            page = pdf[2]
+            assert page.get_textpage().get_text_range().strip() == "three"
+            page.close()
+            pdf.close()
+    finally:
+        mapping.close()
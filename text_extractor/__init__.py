@@ -1,5 +1,5 @@
 from .registry import ExtractorRegistry
-from .exceptions import TextExtractionError, OcrError, UnsupportedFileTypeError
+from .exceptions import TextExtractionError, OcrError, UnsupportedFileTypeError, ExtractionCancelled
 from .strategies.base import ExtractionResult
 from .core import extract, TextExtractor
 
@@ -11,6 +11,7 @@ __all__ = [
     "TextExtractionError",
     "OcrError",
     "UnsupportedFileTypeError",
+    "ExtractionCancelled",
     "ExtractionResult",
     "extract_text",
     "TextExtractor"
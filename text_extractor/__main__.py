@@ -1,8 +1,11 @@
 import argparse
+import functools
+import os
 import sys
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from . import extract_text, TextExtractionError
+from . import extract_text, ExtractorRegistry, TextExtractionError
 
 def setup_logging(verbose: bool):
     level = logging.INFO if verbose else logging.WARNING
@@ -12,41 +15,118 @@ def setup_logging(verbose: bool):
         handlers=[logging.StreamHandler(sys.stdout)]
     )
 
-def main():
+@functools.lru_cache(maxsize=None)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the CLI parser once; repeated main() calls reuse it."""
     parser = argparse.ArgumentParser(description="Extract text from PDF or Image files.")
-    parser.add_argument("input_file", type=str, help="Path to the input file (PDF/Image)")
+    parser.add_argument("input_files", nargs="+", metavar="input_file", help="Path(s) to the input file(s) (PDF/Image)")
     parser.add_argument("--ocr", action="store_true", help="Force usage of OCR extraction")
     parser.add_argument("--language", type=str, default="eng", help="Language code for OCR (default: eng)")
-    parser.add_argument("--output", type=str, help="Path to save output text file (optional)")
+    parser.add_argument("--output", type=str, help="Path to save output text file; a directory when several inputs are given (optional)")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="Worker processes for several inputs (default: CPU count)")
     parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
+    return parser
 
-    args = parser.parse_args()
+def _extract_one(input_path: Path, ocr_mode: str, language: str, ocr_workers=None):
+    """Extract a single file. Top-level so worker processes can unpickle it."""
+    if ocr_workers is not None:
+        ExtractorRegistry.set_ocr_workers(ocr_workers)
+    return extract_text(
+        input_data=input_path,
+        filename=input_path.name,
+        ocr_mode=ocr_mode,
+        language=language
+    )
+
+def _write_result(result, output_path: Path):
+    with open(output_path, "w", encoding="utf-8") as f:
+        # Write page by page so only one page at a time is encoded
+        # into the file buffer, instead of a second full-size copy.
+        # Pages are separated exactly as in result.full_text.
+        for i, page in enumerate(result.pages):
+            if i:
+                f.write("\n\n")
+            f.write(page)
+
+def _iter_results(input_paths, mode: str, language: str, jobs: int):
+    """
+    Yield (path, result, error) for each input, in input order.
+
+    With more than one job the files are extracted in worker processes; each
+    worker keeps its own registry, so strategies are built once per process.
+    The cores are split between the workers so their OCR thread pools don't
+    add up to jobs x cores Tesseract instances.
+    """
+    if jobs <= 1:
+        for path in input_paths:
+            try:
+                yield path, _extract_one(path, mode, language), None
+            except Exception as e:
+                yield path, None, e
+        return
+
+    ocr_workers = max(1, (os.cpu_count() or 1) // jobs)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(_extract_one, path, mode, language, ocr_workers) for path in input_paths]
+        for path, future in zip(input_paths, futures):
+            try:
+                yield path, future.result(), None
+            except Exception as e:
+                yield path, None, e
+
+def _extract_many(input_paths, mode: str, args, logger) -> bool:
+    """Extract several files, continuing past failures. Returns True if all succeeded."""
+    output_dir = Path(args.output) if args.output else None
+    if output_dir:
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+    jobs = min(args.jobs or os.cpu_count() or 1, len(input_paths))
+    ok = True
+    for input_path, result, error in _iter_results(input_paths, mode, args.language, jobs):
+        if error is not None:
+            logger.error(f"Extraction failed for {input_path}: {error}")
+            ok = False
+            continue
+
+        if output_dir:
+            # Keep the original suffix so report.pdf and report.docx don't collide
+            output_path = output_dir / f"{input_path.name}.txt"
+            _write_result(result, output_path)
+            logger.info(f"Output saved to {output_path}")
+        else:
+            print(result.full_text)
+    return ok
+
+def main(argv=None):
+    args = _build_parser().parse_args(argv)
     
     setup_logging(args.verbose)
     logger = logging.getLogger(__name__)
 
-    input_path = Path(args.input_file)
-    if not input_path.exists():
-        logger.error(f"Input file not found: {input_path}")
+    input_paths = [Path(p) for p in args.input_files]
+    missing = [p for p in input_paths if not p.exists()]
+    if missing:
+        for input_path in missing:
+            logger.error(f"Input file not found: {input_path}")
         sys.exit(1)
 
+    mode = 'force' if args.ocr else 'auto'
+
+    if len(input_paths) > 1:
+        if not _extract_many(input_paths, mode, args, logger):
+            sys.exit(1)
+        return
+
+    input_path = input_paths[0]
     try:
         logger.info(f"Extracting text from {input_path}")
         
-        mode = 'force' if args.ocr else 'auto'
-        
         # We can pass path directly now!
-        result = extract_text(
-            input_data=input_path, 
-            filename=input_path.name, 
-            ocr_mode=mode, 
-            language=args.language
-        )
+        result = _extract_one(input_path, mode, args.language)
         
         if args.output:
             output_path = Path(args.output)
-            with open(output_path, "w", encoding="utf-8") as f:
-                f.write(result.full_text)
+            _write_result(result, output_path)
             logger.info(f"Output saved to {output_path}")
         else:
             print(result.full_text)
@@ -1,14 +1,59 @@
-import io
 import logging
+import mmap
+import sys
+import threading
+from itertools import islice
 from pathlib import Path
 from typing import Union, Optional, BinaryIO
 
 from .registry import ExtractorRegistry
 from .strategies.base import ExtractionResult
 from .exceptions import TextExtractionError
+from .utils import BYTES_LIKE
 
 logger = logging.getLogger(__name__)
 
+# Path inputs above this size are memory-mapped instead of opened as files
+MMAP_THRESHOLD_BYTES = 8 * 1024 * 1024
+
+# Native PDF output with fewer non-whitespace chars than this is treated as a scan
+MIN_NATIVE_TEXT_CHARS = 50
+
+def _is_native_pdf(strategy) -> bool:
+    """
+    Type-check `strategy` against PdfNativeStrategy without importing it.
+
+    Strategy modules load lazily; if the PDF one was never imported, no
+    instance of it can exist, and pdfminer stays unloaded.
+    """
+    pdf_module = sys.modules.get(f"{__package__}.strategies.pdf")
+    return pdf_module is not None and isinstance(strategy, pdf_module.PdfNativeStrategy)
+
+def _is_ocr(strategy) -> bool:
+    """Type-check `strategy` against OcrStrategy without importing it."""
+    ocr_module = sys.modules.get(f"{__package__}.strategies.ocr")
+    return ocr_module is not None and isinstance(strategy, ocr_module.OcrStrategy)
+
+# Deletes every character str.isspace() accepts (all of them are below U+3001)
+_DEL_WS_TABLE = dict.fromkeys(c for c in range(0x3001) if chr(c).isspace())
+
+# Real text layers reach the threshold well within this many leading characters
+_NONSPACE_HEAD_CHARS = 4096
+
+def _count_nonspace(text: str, limit: int) -> int:
+    """Count non-whitespace characters in `text`, stopping once `limit` is reached."""
+    # One C-level translate over a bounded head settles almost every document
+    count = len(text[:_NONSPACE_HEAD_CHARS].translate(_DEL_WS_TABLE))
+    if count >= limit:
+        return limit
+    # Mostly-blank head: keep counting past it, still stopping at the limit
+    for ch in islice(text, _NONSPACE_HEAD_CHARS, None):
+        if not ch.isspace():
+            count += 1
+            if count >= limit:
+                break
+    return count
+
 class TextExtractor:
     """
     High-level orchestrator for text extraction.
@@ -17,19 +62,22 @@ class TextExtractor:
 
     @staticmethod
     def extract(
-        input_data: Union[str, Path, bytes, BinaryIO],
+        input_data: Union[str, Path, bytes, bytearray, memoryview, BinaryIO],
         filename: Optional[str] = None,
         ocr_mode: str = 'auto',  # 'auto', 'force', 'skip'
-        language: str = 'eng'
+        language: str = 'eng',
+        cancel_event: Optional[threading.Event] = None
     ) -> ExtractionResult:
         """
         Extract text from various input sources.
 
         Args:
-            input_data: File path (str/Path), bytes, or file-like object.
+            input_data: File path (str/Path), bytes-like object, or file-like object.
             filename: Optional filename to help with type detection (useful if input is bytes).
             ocr_mode: 'auto' (default), 'force' (always use OCR), 'skip' (never use OCR).
             language: Language code for OCR (default: 'eng').
+            cancel_event: Optional event; once set, OCR stops at the next page
+                and ExtractionCancelled is raised.
 
         Returns:
             ExtractionResult object.
@@ -44,10 +92,18 @@ class TextExtractor:
                 if not path.exists():
                     raise TextExtractionError(f"File not found: {path}")
                 filename = filename or path.name
-                stream = open(path, "rb")
+                if path.stat().st_size > MMAP_THRESHOLD_BYTES:
+                    # Large files are mapped rather than read: the kernel pages
+                    # data in on demand and strategies still see a stream.
+                    # The mapping keeps its own handle, so the file can close.
+                    with open(path, "rb") as f:
+                        stream = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    stream = open(path, "rb")
                 should_close = True
-            elif isinstance(input_data, bytes):
-                stream = io.BytesIO(input_data)
+            elif isinstance(input_data, BYTES_LIKE):
+                # Strategies wrap bytes in a stream only if they need one
+                stream = input_data
                 filename = filename or "unknown_file"
             elif hasattr(input_data, "read"):
                 stream = input_data
@@ -73,19 +129,30 @@ class TextExtractor:
             use_ocr_flag = (ocr_mode == 'force')
 
             strategy = ExtractorRegistry.auto_select_strategy(filename, enable_ocr=use_ocr_flag)
+
+            # Only native PDF output can turn out to be a scan; decide up front
+            # so text, docx and image inputs skip the fallback logic entirely.
+            # This keys off the strategy rather than the '.pdf' suffix because
+            # unknown extensions are routed to the PDF strategy too.
+            may_fallback = ocr_mode == 'auto' and _is_native_pdf(strategy)
             
             # 3. Execute Extraction
-            result = strategy.extract(stream, language=language)
+            # OCR is the slow path, so only it checks the cancel event
+            ocr_kwargs = {'cancel_event': cancel_event} if cancel_event is not None else {}
+            if _is_ocr(strategy):
+                result = strategy.extract(stream, language=language, **ocr_kwargs)
+            else:
+                result = strategy.extract(stream, language=language)
             
             # --- SMART FALLBACK CHECK ---
             # If we used Native PDF strategy but got very little text, it might be a scanned PDF.
             # We should fallback to OCR automatically if ocr_mode was 'auto'.
-            is_native_pdf = hasattr(strategy, '__class__') and 'PdfNativeStrategy' in strategy.__class__.__name__
-            
-            if ocr_mode == 'auto' and is_native_pdf:
-                text_len = len(result.full_text.strip())
+            if may_fallback:
+                # Stops at the threshold, so a real text layer costs a few
+                # characters of scanning instead of a stripped copy of it all
+                text_len = _count_nonspace(result.full_text, MIN_NATIVE_TEXT_CHARS)
                 # Heuristic: If text is less than 50 chars and we have pages, likely scanned.
-                if text_len < 50 and result.metadata.get('page_count', 0) > 0:
+                if text_len < MIN_NATIVE_TEXT_CHARS and result.metadata.get('page_count', 0) > 0:
                     logger.warning(f"Native extraction yielded only {text_len} chars. Falling back to OCR.")
                     
                     # Reset stream for retry
@@ -94,7 +161,7 @@ class TextExtractor:
                         
                     # Switch to OCR Strategy
                     ocr_strategy = ExtractorRegistry.get_strategy('ocr')
-                    ocr_result = ocr_strategy.extract(stream, language=language)
+                    ocr_result = ocr_strategy.extract(stream, language=language, **ocr_kwargs)
                     
                     # Append metadata to indicate fallback occurred
                     ocr_result.metadata['fallback_triggered'] = True
@@ -113,10 +180,11 @@ class TextExtractor:
 
 # Functional Alias for ease of use
 def extract(
-    input_data: Union[str, Path, bytes, BinaryIO],
+    input_data: Union[str, Path, bytes, bytearray, memoryview, BinaryIO],
     filename: Optional[str] = None,
     ocr_mode: str = 'auto',
-    language: str = 'eng'
+    language: str = 'eng',
+    cancel_event: Optional[threading.Event] = None
 ) -> ExtractionResult:
     """Helper function to extract text without instantiating a class."""
-    return TextExtractor.extract(input_data, filename, ocr_mode, language)
+    return TextExtractor.extract(input_data, filename, ocr_mode, language, cancel_event)
@@ -9,3 +9,7 @@ class UnsupportedFileTypeError(TextExtractionError):
 class OcrError(TextExtractionError):
     """Raised when OCR fails."""
     pass
+
+class ExtractionCancelled(TextExtractionError):
+    """Raised when an extraction is stopped through its cancel event."""
+    pass
@@ -1,19 +1,62 @@
+import importlib
+import logging
+import os
 from .strategies.base import BaseExtractionStrategy
-from .strategies.pdf import PdfNativeStrategy
-from .strategies.ocr import OcrStrategy
-from .strategies.text import RawTextStrategy
-from .strategies.docx import DocxStrategy
 from .exceptions import UnsupportedFileTypeError
 
+logger = logging.getLogger(__name__)
+
+# File extension -> strategy name, resolved with a single lookup per file
+_EXT_TO_METHOD = {
+    '.pdf': 'pdf_native',
+    # Images go straight to OCR
+    '.png': 'ocr',
+    '.jpg': 'ocr',
+    '.jpeg': 'ocr',
+    '.tiff': 'ocr',
+    '.bmp': 'ocr',
+    # Raw text
+    '.txt': 'raw_text',
+    '.md': 'raw_text',
+    '.csv': 'raw_text',
+    '.json': 'raw_text',
+    '.xml': 'raw_text',
+    # Word Docs
+    '.docx': 'docx',
+}
+
+# Strategy name -> (module, class, constructor kwargs). Modules are imported on
+# first use so that e.g. a .txt extraction never pays for pdfminer,
+# pytesseract or python-docx.
+_STRATEGY_CLASSES = {
+    'pdf_native': ('.strategies.pdf', 'PdfNativeStrategy', {}),
+    'pdf_fast': ('.strategies.pdf', 'PdfNativeStrategy', {'fast': True}),
+    'pdf_parallel': ('.strategies.pdf', 'PdfNativeStrategy', {'parallel': True}),
+    'ocr': ('.strategies.ocr', 'OcrStrategy', {}),
+    # Forced OCR: recognise every page, even those with a text layer
+    'ocr_all_pages': ('.strategies.ocr', 'OcrStrategy', {'native_text_min_chars': 0}),
+    'raw_text': ('.strategies.text', 'RawTextStrategy', {}),
+    'docx': ('.strategies.docx', 'DocxStrategy', {}),
+}
+
 class ExtractorRegistry:
     """Factory and registry for text extraction strategies."""
     
-    _strategies = {
-        'pdf_native': PdfNativeStrategy(),
-        'ocr': OcrStrategy(),
-        'raw_text': RawTextStrategy(),
-        'docx': DocxStrategy()
-    }
+    # Instantiated strategies, filled lazily by get_strategy()
+    _strategies = {}
+    # OCR worker threads per extraction; None lets OcrStrategy use every core
+    _ocr_workers = None
+
+    @staticmethod
+    def set_ocr_workers(workers) -> None:
+        """
+        Cap the threads each OCR extraction uses, for processes that run
+        several extractions at once; None restores one per core.
+        """
+        ExtractorRegistry._ocr_workers = workers
+        for method, strategy in ExtractorRegistry._strategies.items():
+            if _STRATEGY_CLASSES[method][1] == 'OcrStrategy':
+                strategy.workers = workers
 
     @staticmethod
     def get_strategy(method: str) -> BaseExtractionStrategy:
@@ -21,43 +64,37 @@ class ExtractorRegistry:
         Get a specific extraction strategy.
         
         Args:
-           method: 'pdf_native' or 'ocr'
+           method: 'pdf_native', 'pdf_fast', 'pdf_parallel', 'ocr',
+               'ocr_all_pages', 'raw_text' or 'docx'
         """
-        if method not in ExtractorRegistry._strategies:
-             raise UnsupportedFileTypeError(f"Unknown extraction method: {method}")
-        return ExtractorRegistry._strategies[method]
+        strategy = ExtractorRegistry._strategies.get(method)
+        if strategy is None:
+            if method not in _STRATEGY_CLASSES:
+                raise UnsupportedFileTypeError(f"Unknown extraction method: {method}")
+            module_name, class_name, kwargs = _STRATEGY_CLASSES[method]
+            if class_name == 'OcrStrategy':
+                kwargs = {**kwargs, 'workers': ExtractorRegistry._ocr_workers}
+            module = importlib.import_module(module_name, __package__)
+            strategy = getattr(module, class_name)(**kwargs)
+            ExtractorRegistry._strategies[method] = strategy
+        return strategy
 
     @staticmethod
     def auto_select_strategy(filename: str, enable_ocr: bool = False) -> BaseExtractionStrategy:
         """
         Selects the best strategy based on filename and user preference.
         """
-        import logging
-        logger = logging.getLogger(__name__)
-        
         # Simple logic for now, can be expanded to detect scanned PDFs automatically
         if enable_ocr:
             logger.info("Strategy selected: OCR (User override)")
-            return ExtractorRegistry.get_strategy('ocr')
+            # The user asked for Tesseract, so text layers are not trusted
+            return ExtractorRegistry.get_strategy('ocr_all_pages')
         
-        if filename.lower().endswith('.pdf'):
-            logger.info("Strategy selected: PDF Native")
-            return ExtractorRegistry.get_strategy('pdf_native')
+        ext = os.path.splitext(filename.lower())[1]
+        method = _EXT_TO_METHOD.get(ext)
+        if method is None:
+            logger.warning("Unknown file type for %s, falling back to PDF Native", filename)
+            return ExtractorRegistry.get_strategy('pdf_native') # Default fallback?
         
-        # If it's an image, default to OCR
-        if filename.lower().endswith(('.png', '.jpg', '.jpeg', '.tiff', '.bmp')):
-            logger.info("Strategy selected: OCR (Image detected)")
-            return ExtractorRegistry.get_strategy('ocr')
-            
-        # Raw text
-        if filename.lower().endswith(('.txt', '.md', '.csv', '.json', '.xml')):
-            logger.info("Strategy selected: Raw Text")
-            return ExtractorRegistry.get_strategy('raw_text')
-
-        # Word Docs
-        if filename.lower().endswith('.docx'):
-            logger.info("Strategy selected: Docx")
-            return ExtractorRegistry.get_strategy('docx')
-            
-        logger.warning(f"Unknown file type for {filename}, falling back to PDF Native")
-        return ExtractorRegistry.get_strategy('pdf_native') # Default fallback?
+        logger.info("Strategy selected: %s (%s)", method, ext)
+        return ExtractorRegistry.get_strategy(method)
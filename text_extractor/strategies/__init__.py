@@ -1,16 +1,28 @@
 from .base import BaseExtractionStrategy, ExtractionResult
-from .pdf import PdfNativeStrategy
-from .ocr import OcrStrategy
-from .text import RawTextStrategy
-from .docx import DocxStrategy
-from .ocr import OcrStrategy
 
+# Concrete strategies are imported on first access (PEP 562) so that
+# importing the package does not pull in every optional heavy dependency.
+_LAZY_IMPORTS = {
+    "PdfNativeStrategy": ".pdf",
+    "OcrStrategy": ".ocr",
+    "RawTextStrategy": ".text",
+    "DocxStrategy": ".docx",
+}
 
 
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        import importlib
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "BaseExtractionStrategy",
     "ExtractionResult",
     "PdfNativeStrategy",
-    "OcrStrategy"
-]
\ No newline at end of file
+    "OcrStrategy",
+    "RawTextStrategy",
+    "DocxStrategy",
+]
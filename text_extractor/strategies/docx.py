@@ -1,7 +1,9 @@
 from .base import BaseExtractionStrategy, ExtractionResult
+from ..utils import ensure_stream, stream_size
 import logging
 from docx import Document
 import io
+import mmap
 
 logger = logging.getLogger(__name__)
 
@@ -10,6 +12,7 @@ class DocxStrategy(BaseExtractionStrategy):
 
     def extract(self, file_stream, language: str = 'eng') -> ExtractionResult:
         logger.info("Starting Docx extraction.")
+        file_stream = ensure_stream(file_stream)
         try:
             # Ensure at start
             if hasattr(file_stream, 'seek'):
@@ -20,21 +23,33 @@ class DocxStrategy(BaseExtractionStrategy):
             # this may cause memory issues. Unfortunately, the library doesn't support streaming.
             
             # Check file size if possible
-            if hasattr(file_stream, 'seek') and hasattr(file_stream, 'tell'):
-                file_stream.seek(0, 2)  # Seek to end
-                file_size_mb = file_stream.tell() / (1024 * 1024)
-                file_stream.seek(0)  # Reset
-                
+            file_size = stream_size(file_stream)
+            if file_size is not None:
+                file_size_mb = file_size / (1024 * 1024)
                 if file_size_mb > 50:
                     logger.warning(f"Large DOCX file detected: {file_size_mb:.1f} MB. This may use significant memory.")
             
+            if isinstance(file_stream, mmap.mmap):
+                # zipfile needs a full io stream (seekable()), which mmap lacks;
+                # python-docx reads every part into memory anyway
+                file_stream = io.BytesIO(file_stream)
+
             doc = Document(file_stream)
             
-            full_text = []
+            # Grow a single buffer instead of collecting a list and joining it
+            buf = io.StringIO()
+            write = buf.write
+            sep = ""
+            # doc.paragraphs builds a fresh list from the XML on every access,
+            # so count during this pass instead of calling len() on it again
+            paragraph_count = 0
             for para in doc.paragraphs:
-                full_text.append(para.text)
-                
-            text_content = "\n".join(full_text)
+                write(sep)
+                write(para.text)
+                sep = "\n"
+                paragraph_count += 1
+
+            text_content = buf.getvalue()
             
             # Docx doesn't map strictly to "pages" in a print sense without rendering, 
             # so we treat it as a continuous document or paragraphs?
@@ -44,12 +59,12 @@ class DocxStrategy(BaseExtractionStrategy):
             
             pages = [text_content]
 
-            logger.info(f"Docx extraction successful. extracted {len(doc.paragraphs)} paragraphs.")
+            logger.info(f"Docx extraction successful. extracted {paragraph_count} paragraphs.")
             
             return ExtractionResult(
                 full_text=text_content,
                 pages=pages,
-                metadata={"method": "docx", "page_count": 1, "paragraph_count": len(doc.paragraphs)}
+                metadata={"method": "docx", "page_count": 1, "paragraph_count": paragraph_count}
             )
 
         except Exception as e:
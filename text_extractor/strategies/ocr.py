@@ -1,105 +1,441 @@
-from pdf2image import convert_from_bytes, convert_from_path, pdfinfo_from_path
+import pypdfium2 as pdfium
 import pytesseract
 from PIL import Image
 from .base import BaseExtractionStrategy, ExtractionResult
-from ..exceptions import OcrError
+from ..utils import PDFIUM_LOCK, ensure_stream, open_pdf_document
+from ..exceptions import ExtractionCancelled, OcrError
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
 import logging
+import os
+import queue
+import tempfile
+
+# Pages are already recognised in parallel, one Tesseract per worker; its own
+# OpenMP threads would only oversubscribe the CPU (see the Tesseract FAQ).
+# Set before tesserocr loads libtesseract; pytesseract's subprocesses
+# inherit it. An explicit user setting wins.
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+try:
+    # Optional: in-process Tesseract bindings. When installed, each worker
+    # thread loads the language model once instead of spawning a tesseract
+    # process (and re-initialising it) for every page.
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+try:
+    # Optional: OpenCV, for the opt-in adaptive binarisation before OCR
+    import cv2
+    import numpy as np
+except ImportError:
+    cv2 = None
 
 logger = logging.getLogger(__name__)
 
+
+@contextmanager
+def _recognizer(language: str, oem=None, psm=None):
+    """
+    Yield a thread-safe `recognize(image) -> str` callable.
+
+    With tesserocr, API instances are pooled and reused across pages and
+    released on exit; otherwise each call runs the tesseract CLI.
+    `oem`/`psm` override Tesseract's engine and page segmentation modes.
+    """
+    if tesserocr is None:
+        config = _cli_config(oem, psm)
+        yield lambda image: _tesseract_image(image, language, config)
+        return
+
+    options = {}
+    if oem is not None:
+        options["oem"] = oem
+    if psm is not None:
+        options["psm"] = psm
+
+    idle = queue.SimpleQueue()
+    created = []
+
+    def recognize(image):
+        try:
+            api = idle.get_nowait()
+        except queue.Empty:
+            # At most one instance per concurrently running worker
+            api = tesserocr.PyTessBaseAPI(lang=language, **options)
+            created.append(api)
+        try:
+            api.SetImage(image)
+            return api.GetUTF8Text()
+        finally:
+            idle.put(api)
+
+    try:
+        yield recognize
+    finally:
+        for api in created:
+            api.End()
+
+
+def _cli_config(oem=None, psm=None) -> str:
+    """tesseract CLI flags for the given engine/segmentation modes."""
+    flags = []
+    if oem is not None:
+        flags.append(f"--oem {oem}")
+    if psm is not None:
+        flags.append(f"--psm {psm}")
+    return " ".join(flags)
+
+
+def _tesseract_page(path, language: str, config: str = "") -> str:
+    # Drop the form feed tesseract ends each page with, as batched runs do
+    text = pytesseract.image_to_string(path, lang=language, config=config)
+    return text[:-1] if text.endswith("\f") else text
+
+
+def _tesseract_image(image, language: str, config: str = "") -> str:
+    """
+    OCR a PIL image with the tesseract CLI.
+
+    pytesseract would save the image in its source format, re-encoding a
+    JPEG (lossily) just for tesseract to decode it again. Modes PNM can
+    hold are written uncompressed instead; others keep pytesseract's PNG.
+    """
+    if image.mode not in ("1", "L", "RGB"):
+        return pytesseract.image_to_string(image, lang=language, config=config)
+    with tempfile.TemporaryDirectory(prefix="ocr_") as tmpdir:
+        path = os.path.join(tmpdir, "image.pnm")
+        image.save(path, format="PPM")
+        return pytesseract.image_to_string(path, lang=language, config=config)
+
+
+def _tesseract_pages(paths, language: str, config: str = ""):
+    """OCR the page images at `paths` with a single tesseract process."""
+    if len(paths) == 1:
+        return [_tesseract_page(paths[0], language, config)]
+
+    list_path = os.path.splitext(paths[0])[0] + ".list.txt"
+    with open(list_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(paths))
+    try:
+        output = pytesseract.image_to_string(list_path, lang=language, config=config)
+    finally:
+        os.unlink(list_path)
+
+    # Tesseract ends every page with a form feed
+    texts = output.split("\f")
+    if len(texts) < len(paths):
+        # Unexpected output shape: fall back to one process per page
+        logger.warning("Tesseract batch returned %d pages for %d images; retrying one by one", len(texts), len(paths))
+        return [_tesseract_page(path, language, config) for path in paths]
+    return texts[:len(paths)]
+
+
+_DONE = object()
+
+
+def _ordered_map(executor, fn, items, max_in_flight, release=None):
+    """
+    Like executor.map, but pull from `items` lazily with a bounded window.
+
+    Items are produced on the calling thread (so pdfium rendering never leaves
+    it) while earlier ones are processed by the pool; at most `max_in_flight`
+    are submitted but not yet collected. `release(item)` is called on the
+    calling thread once an item's result has been collected or, on failure,
+    after the pool has finished with it.
+    """
+    items = iter(items)
+    in_flight = deque()  # (future, item), in order
+
+    def collect_oldest():
+        future, item = in_flight.popleft()
+        try:
+            return future.result()
+        finally:
+            if release is not None:
+                release(item)
+
+    try:
+        while True:
+            # Make room before producing the next item, so no more than
+            # max_in_flight items exist at once
+            if len(in_flight) >= max_in_flight:
+                yield collect_oldest()
+            item = next(items, _DONE)
+            if item is _DONE:
+                break
+            in_flight.append((executor.submit(fn, item), item))
+        while in_flight:
+            yield collect_oldest()
+    finally:
+        # Stop a producer generator here rather than whenever it is collected
+        if hasattr(items, 'close'):
+            items.close()
+        for future, _ in in_flight:
+            future.cancel()
+        wait([future for future, _ in in_flight])
+        if release is not None:
+            for _, item in in_flight:
+                release(item)
+
+
 class OcrStrategy(BaseExtractionStrategy):
     """Extracts text from PDFs/Images using OCR (Tesseract)."""
 
-    def extract(self, file_stream, language: str = 'eng') -> ExtractionResult:
+    # Tesseract binarises its input anyway, so colour adds nothing; 150 DPI
+    # still gives body text the ~20px x-height Tesseract reads best, at
+    # roughly a sixth of the bytes of a 200 DPI RGB render
+    RENDER_DPI = 150
+    PAGES_IN_FLIGHT_PER_WORKER = 2
+    # Pages recognised by one tesseract process when tesserocr is unavailable
+    PAGES_PER_TESSERACT_CALL = 8
+    # cv2.adaptiveThreshold neighbourhood (px, odd) and offset; 31px spans
+    # a few text lines at RENDER_DPI, so uneven scan lighting evens out
+    BINARIZE_BLOCK_SIZE = 31
+    BINARIZE_OFFSET = 10
+
+    def __init__(self, binarize: bool = False, native_text_min_chars: int = 100, oem=None, psm=None, workers=None):
+        if binarize and cv2 is None:
+            logger.warning("Binarisation requested but OpenCV (cv2) is not installed; OCR will use unprocessed images")
+        # Adaptive thresholding helps unevenly lit or noisy scans; off by
+        # default since Tesseract binarises clean renders well on its own
+        self.binarize = binarize and cv2 is not None
+        # PDF pages whose text layer has at least this many non-whitespace
+        # chars are taken as-is instead of OCR'd; 0 OCRs every page
+        self.native_text_min_chars = native_text_min_chars
+        # Tesseract engine / page segmentation modes; None keeps its defaults
+        # (OEM 3 already runs LSTM-only when the traineddata has an LSTM model)
+        self.oem = oem
+        self.psm = psm
+        # Pages recognised at once; None uses one per core. Lower it when
+        # several OCR runs share the machine (CLI -j, the app's job pool).
+        self.workers = workers
+
+    def extract(self, file_stream, language: str = 'eng', cancel_event=None) -> ExtractionResult:
+        """
+        OCR every page. If `cancel_event` (a threading.Event) gets set, stops
+        at the next page and raises ExtractionCancelled.
+        """
+        native_pages = []
+        pages_text = []
+        pages = self._iter_pages(file_stream, language, native_pages)
+        try:
+            for _, text in pages:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ExtractionCancelled("OCR cancelled")
+                pages_text.append(text)
+        finally:
+            # Stops rendering and frees pages still queued for Tesseract
+            pages.close()
+        full_text = "\n\n".join(pages_text)
+
+        logger.info(f"OCR extraction successful. Extracted {len(pages_text)} pages ({len(native_pages)} from the text layer).")
+        return ExtractionResult(
+            full_text=full_text,
+            pages=pages_text,
+            metadata={
+                "method": "ocr", "language": language, "page_count": len(pages_text),
+                "native_text_pages": len(native_pages),
+            }
+        )
+
+    def iter_pages(self, file_stream, language: str = 'eng'):
+        """
+        Yield `(page_index, text)` for each page, in order, as soon as it is
+        recognised, so callers can write results out without holding the
+        whole document's text. Closing the generator early stops the work
+        and frees pending pages. Raises OcrError like extract().
+        """
+        return self._iter_pages(file_stream, language, [])
+
+    def _iter_pages(self, file_stream, language: str, native_pages):
         logger.info(f"Starting OCR extraction with language={language}")
+        file_stream = ensure_stream(file_stream)
         try:
-            # OCR Efficiency: Use temporary file to avoid loading full PDF into RAM for conversion
-            import tempfile
-            import os
-            
-            # Use .pdf as default suffix to help pdf2image, but internal content matters more
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-                # Copy stream to temp file
-                if hasattr(file_stream, 'seek'):
-                    file_stream.seek(0)
-                
-                # Copy in chunks
-                import shutil
-                shutil.copyfileobj(file_stream, tmp_file)
-                tmp_path = tmp_file.name
-            
+            if hasattr(file_stream, 'seek'):
+                file_stream.seek(0)
+
+            # Try treating as PDF first. Pages are rendered in-process by
+            # pdfium straight from the stream: no temp file, no poppler
+            # subprocess and no JPEG round-trip per page.
             try:
-                # Use convert_from_path which is more memory efficient than bytes
-                # We can also set thread_count
-                
-                logger.info(f"Processing via temp file: {tmp_path}")
-                
-                # Try treating as PDF first
-                try:
-                    info = pdfinfo_from_path(tmp_path)
-                    total_pages = info["Pages"]
-                    
-                    pages_text = []
-                    BATCH_SIZE = 5 # Process 5 pages at a time to keep RAM low
-                    
-                    for start_page in range(1, total_pages + 1, BATCH_SIZE):
-                        end_page = min(start_page + BATCH_SIZE - 1, total_pages)
-                        logger.info(f"Processing batch: Pages {start_page} to {end_page}")
-                        
-                        batch_images = convert_from_path(
-                            tmp_path, 
-                            first_page=start_page, 
-                            last_page=end_page,
-                            thread_count=2,
-                            fmt='jpeg'
-                        )
-                        
-                        # Parallelize OCR on the batch of images
-                        from concurrent.futures import ThreadPoolExecutor, as_completed
-                        
-                        def process_image(img):
-                            try:
-                                txt = pytesseract.image_to_string(img, lang=language)
-                                return txt
-                            finally:
-                                if hasattr(img, 'close'):
-                                    img.close()
-
-                        # Use max_workers=BATCH_SIZE or cpu_count
-                        with ThreadPoolExecutor(max_workers=min(BATCH_SIZE, os.cpu_count() or 4)) as executor:
-                             # We need to preserve order, so we map
-                             results = list(executor.map(process_image, batch_images))
-                             pages_text.extend(results)
-                        
-                        # Clear batch list
-                        del batch_images
-                
-                except Exception as pdf_err:
-                    logger.info(f"PDF processing failed ({pdf_err}), attempting fallback to standard image loader.")
+                pdf = open_pdf_document(file_stream)
+            except pdfium.PdfiumError as pdf_err:
+                logger.info(f"PDF processing failed ({pdf_err}), attempting fallback to standard image loader.")
+                pdf = None
+
+            with _recognizer(language, self.oem, self.psm) as recognize:
+                if pdf is not None:
+                    if tesserocr is not None:
+                        pages = self._ocr_pdf(pdf, recognize, native_pages)
+                    else:
+                        pages = self._ocr_pdf_batched(pdf, language, native_pages)
+                    try:
+                        yield from enumerate(pages)
+                    finally:
+                        # Finish with the pages before the document goes
+                        pages.close()
+                        with PDFIUM_LOCK:
+                            pdf.close()
+                else:
                     # Fallback: Try opening as a single image using PIL
-                    image = Image.open(tmp_path)
-                    
-                    # OCR the single image
-                    text = pytesseract.image_to_string(image, lang=language)
-                    pages_text = [text]
-                    
-                    if hasattr(image, 'close'):
-                        image.close()
-                
-                full_text = "\n\n".join(pages_text)
-                
-            finally:
-                # Clean up temp file
-                if os.path.exists(tmp_path):
-                    os.unlink(tmp_path)
-            
-            logger.info(f"OCR extraction successful. Extracted {len(pages_text)} pages.")
-            return ExtractionResult(
-                full_text=full_text,
-                pages=pages_text,
-                metadata={"method": "ocr", "language": language, "page_count": len(pages_text)}
-            )
+                    file_stream.seek(0)
+                    with Image.open(file_stream) as image:
+                        # OCR the single image
+                        text = recognize(self._prepare(image))
+                    yield 0, text
 
         except Exception as e:
             logger.error(f"OCR extraction failed: {e}")
             raise OcrError(f"OCR process failed: {str(e)}")
+
+    def _worker_count(self) -> int:
+        # Single-threaded Tesseract scales with one worker per core
+        return self.workers or os.cpu_count() or 4
+
+    def _prepare(self, image):
+        """Return `image` as handed to Tesseract: binarised if enabled, else unchanged."""
+        if not self.binarize:
+            return image
+        if image.mode != "L":
+            image = image.convert("L")
+        binary = cv2.adaptiveThreshold(
+            np.asarray(image), 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY,
+            self.BINARIZE_BLOCK_SIZE, self.BINARIZE_OFFSET,
+        )
+        return Image.fromarray(binary)
+
+    def _native_text(self, page):
+        """
+        The page's text layer if it has enough text to skip OCR, else None.
+        Callers hold PDFIUM_LOCK.
+        """
+        if not self.native_text_min_chars:
+            return None
+        textpage = page.get_textpage()
+        try:
+            # pdfium separates lines with CRLF
+            text = textpage.get_text_range().replace("\r\n", "\n")
+        finally:
+            textpage.close()
+        if len("".join(text.split())) < self.native_text_min_chars:
+            return None
+        return text
+
+    def _render_pages(self, pdf, native_pages):
+        """
+        Yield every page in order, on the calling thread: its native text
+        (a str, index recorded in `native_pages`) when the text layer is
+        rich enough, otherwise a grayscale bitmap to OCR.
+
+        PDFIUM_LOCK is held per page, never across a yield, so other
+        threads (e.g. preview rendering) can use pdfium in between.
+        """
+        scale = self.RENDER_DPI / 72
+        with PDFIUM_LOCK:
+            total_pages = len(pdf)
+        for index in range(total_pages):
+            with PDFIUM_LOCK:
+                page = pdf[index]
+                try:
+                    text = self._native_text(page)
+                    if text is None:
+                        bitmap = page.render(scale=scale, grayscale=True)
+                finally:
+                    page.close()
+            if text is not None:
+                native_pages.append(index)
+                yield text
+            else:
+                yield bitmap
+
+    def _ocr_pdf(self, pdf, recognize, native_pages):
+        """Yield page texts in order, recognised in-process (tesserocr)."""
+        with PDFIUM_LOCK:
+            total_pages = len(pdf)
+        workers = self._worker_count()
+        logger.info(f"Recognising {total_pages} pages with {workers} workers")
+
+        def process_image(bitmap):
+            if isinstance(bitmap, str):
+                return bitmap  # Text layer, nothing to recognise
+            # Only PIL and tesseract run here; all pdfium calls stay on the
+            # calling thread, under PDFIUM_LOCK, because pdfium is not
+            # thread-safe. The "L" image shares the bitmap's buffer, which
+            # stays alive until collected.
+            return recognize(self._prepare(bitmap.to_pil()))
+
+        def release(bitmap):
+            if not isinstance(bitmap, str):
+                with PDFIUM_LOCK:
+                    bitmap.close()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            yield from _ordered_map(
+                executor, process_image, self._render_pages(pdf, native_pages),
+                max_in_flight=self.PAGES_IN_FLIGHT_PER_WORKER * workers,
+                release=release,
+            )
+
+    def _ocr_pdf_batched(self, pdf, language: str, native_pages):
+        """
+        Yield page texts in order, recognised by the tesseract CLI, several
+        pages per process.
+
+        Each rendered page is written to a temp directory as an uncompressed
+        PGM and its bitmap freed at once, so pages waiting for a worker cost
+        disk rather than RAM. A worker hands tesseract a list file naming a
+        run of pages: the process starts and loads the language model once
+        for all of them, and separates the pages' text with form feeds.
+        Pages taken from the text layer ride along in their run, in order.
+        """
+        with PDFIUM_LOCK:
+            total_pages = len(pdf)
+        workers = self._worker_count()
+        # Large runs amortise start-up; short documents still use every worker
+        per_call = max(1, min(self.PAGES_PER_TESSERACT_CALL, -(-total_pages // workers)))
+        logger.info(f"Recognising {total_pages} pages with {workers} workers, {per_call} pages per tesseract call")
+
+        config = _cli_config(self.oem, self.psm)
+        with tempfile.TemporaryDirectory(prefix="ocr_") as tmpdir:
+
+            def write_runs():
+                # Entries are (image path, None) or (None, native text)
+                run, images = [], 0
+                for index, bitmap in enumerate(self._render_pages(pdf, native_pages)):
+                    if isinstance(bitmap, str):
+                        run.append((None, bitmap))
+                        continue
+                    path = os.path.join(tmpdir, f"page-{index:05d}.pgm")
+                    try:
+                        self._prepare(bitmap.to_pil()).save(path)
+                    finally:
+                        with PDFIUM_LOCK:
+                            bitmap.close()
+                    run.append((path, None))
+                    images += 1
+                    if images == per_call:
+                        yield run
+                        run, images = [], 0
+                if run:
+                    yield run
+
+            def process_run(run):
+                paths = [path for path, _ in run if path is not None]
+                try:
+                    texts = iter(_tesseract_pages(paths, language, config) if paths else ())
+                    return [next(texts) if path is not None else text for path, text in run]
+                finally:
+                    for path in paths:
+                        os.unlink(path)
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                # One queued run beyond the busy workers keeps them all fed
+                runs = _ordered_map(executor, process_run, write_runs(), max_in_flight=workers + 1)
+                try:
+                    for texts in runs:
+                        yield from texts
+                finally:
+                    runs.close()
@@ -1,47 +1,112 @@
-from io import StringIO
+from io import BytesIO, StringIO
+from concurrent.futures import ProcessPoolExecutor
 from pdfminer.converter import TextConverter
 from pdfminer.pdfinterp import PDFResourceManager, PDFPageInterpreter
 from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdfdocument import PDFDocument
 from pdfminer.layout import LAParams
 from pdfminer.high_level import extract_text_to_fp
 import logging
+import multiprocessing
+import os
 
 from .base import BaseExtractionStrategy, ExtractionResult
+from ..utils import PDFIUM_LOCK, ensure_stream, open_pdf_document
 from ..exceptions import TextExtractionError
 
 logger = logging.getLogger(__name__)
 
+
+def _extract_pages(file_stream, pagenos=None, maxpages=0, laparams=None):
+    """Run pdfminer over `file_stream`, returning one string per page."""
+    if laparams is None:
+        laparams = LAParams()
+
+    # Per document: pdfminer caches fonts by PDF object id, and ids are
+    # only unique within one file, so a manager shared across documents
+    # would decode text with another file's fonts. CMaps are cached
+    # process-wide by pdfminer regardless.
+    rsrcmgr = PDFResourceManager()
+    pages_text = []
+
+    # One converter, interpreter and buffer serve every page; the
+    # buffer is drained after each page instead of being rebuilt
+    retstr = StringIO()
+    device = TextConverter(rsrcmgr, retstr, laparams=laparams)
+    interpreter = PDFPageInterpreter(rsrcmgr, device)
+    try:
+        for page in PDFPage.get_pages(file_stream, pagenos=pagenos, maxpages=maxpages, check_extractable=True):
+            interpreter.process_page(page)
+            pages_text.append(retstr.getvalue())
+            retstr.seek(0)
+            retstr.truncate()
+    finally:
+        device.close()
+    return pages_text
+
+
+def _extract_page_range(pdf_bytes: bytes, start: int, end: int, laparams=None):
+    """Worker entry point: extract pages [start, end) of an in-memory PDF."""
+    return _extract_pages(BytesIO(pdf_bytes), pagenos=set(range(start, end)), maxpages=end, laparams=laparams)
+
+
+def _count_pages(file_stream) -> int:
+    """
+    Count pages the way PDFPage.get_pages numbers them, by walking the
+    page tree without interpreting any page content.
+    """
+    document = PDFDocument(PDFParser(file_stream))
+    return sum(1 for _ in PDFPage.create_pages(document))
+
+
 class PdfNativeStrategy(BaseExtractionStrategy):
-    """Extracts text from PDFs using pdfminer.six (native extraction)."""
+    """
+    Extracts text from PDFs using pdfminer.six (native extraction).
+
+    With `fast=True`, text is first read with pdfium, which is many times
+    faster than pdfminer's layout analysis; pdfminer runs only if pdfium
+    cannot open the file or finds almost no text.
+
+    With `parallel=True`, documents of PARALLEL_MIN_PAGES or more are
+    split across spawned worker processes. It is off by default: spawn
+    re-imports the caller's main module, so scripts must guard their entry
+    point with `if __name__ == "__main__":`, and callers that already run
+    one extraction per process (e.g. `python -m text_extractor -j N`)
+    would multiply processes.
+    """
+
+    # Fast-path output with fewer non-whitespace chars than this is retried with pdfminer
+    MIN_FAST_TEXT_CHARS = 50
+    # Documents with at least this many pages are split across worker
+    # processes; below it, process start-up costs more than it saves
+    PARALLEL_MIN_PAGES = 32
+
+    def __init__(self, fast: bool = False, parallel: bool = False):
+        self.fast = fast
+        self.parallel = parallel
+        # Layout settings are read-only during extraction, so one instance
+        # serves every document
+        self.laparams = LAParams()
 
     def extract(self, file_stream, language: str = 'eng') -> ExtractionResult:
         logger.info("Starting PDF native extraction.")
+        file_stream = ensure_stream(file_stream)
         try:
+            if self.fast:
+                file_stream.seek(0)
+                result = self._extract_fast(file_stream)
+                if result is not None:
+                    return result
+
             # pdfminer.six works best with file paths or seekable streams.
             # reset stream just in case
             file_stream.seek(0)
-            
-            # Iterate pages and extract text
-            # Optimizing to single-pass extraction
-             
-             
-            laparams = LAParams()
 
-            rsrcmgr = PDFResourceManager()
-            pages_text = []
-            
-            for page in PDFPage.get_pages(file_stream, check_extractable=True):
-                 page_retstr = StringIO()
-                 page_device = TextConverter(rsrcmgr, page_retstr, laparams=laparams)
-                 page_interpreter = PDFPageInterpreter(rsrcmgr, page_device)
-                 page_interpreter.process_page(page)
-                 
-                 text = page_retstr.getvalue()
-                 pages_text.append(text)
-                 
-                 # clean up
-                 page_device.close()
-                 page_retstr.close()
+            pages_text = self._extract_parallel(file_stream) if self.parallel else None
+            if pages_text is None:
+                file_stream.seek(0)
+                pages_text = _extract_pages(file_stream, laparams=self.laparams)
             
             full_text = "\n\n".join(pages_text) # Reconstruct full text from pages to be consistent
             
@@ -55,3 +120,95 @@ class PdfNativeStrategy(BaseExtractionStrategy):
         except Exception as e:
             logger.error(f"PDF extraction failed: {e}")
             raise TextExtractionError(f"Failed to extract text from PDF: {str(e)}")
+
+    def _extract_parallel(self, file_stream):
+        """
+        Extract large PDFs with one pdfminer process per page range.
+
+        pdfminer is pure Python and CPU-bound, so pages only parse in
+        parallel in separate processes. Returns None when the document is
+        too small (or has too few CPUs) to be worth it.
+        """
+        workers = os.cpu_count() or 1
+        if workers < 2:
+            return None
+
+        # Counted by pdfminer itself so the ranges match the page numbers
+        # the workers see; pdfium may count a damaged page tree differently
+        try:
+            total_pages = _count_pages(file_stream)
+        except Exception:
+            return None  # The serial path reports the problem
+        if total_pages < self.PARALLEL_MIN_PAGES:
+            return None
+
+        file_stream.seek(0)
+        if isinstance(file_stream, BytesIO):
+            pdf_bytes = file_stream.getvalue()
+        else:
+            pdf_bytes = file_stream.read()
+
+        workers = min(workers, total_pages)
+        step = -(-total_pages // workers)
+        ranges = [(start, min(start + step, total_pages)) for start in range(0, total_pages, step)]
+        logger.info(f"Extracting {total_pages} pages in {len(ranges)} processes")
+
+        # spawn, not fork: callers (e.g. the web app) run extraction on
+        # worker threads, and forking a threaded process is unsafe
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=len(ranges), mp_context=context) as executor:
+            futures = [
+                executor.submit(_extract_page_range, pdf_bytes, start, end, self.laparams)
+                for start, end in ranges
+            ]
+            pages_text = []
+            for future in futures:
+                pages_text.extend(future.result())
+        return pages_text
+
+    def _extract_fast(self, file_stream):
+        """Extract with pdfium; None if pdfminer should handle the file instead."""
+        import pypdfium2 as pdfium
+
+        try:
+            pdf = open_pdf_document(file_stream)
+        except pdfium.PdfiumError as e:
+            logger.info(f"pdfium could not open the PDF ({e}), using pdfminer.")
+            return None
+
+        pages_text = []
+        # pdfium is not thread-safe; the lock is taken per page so other
+        # threads' pdfium work can interleave
+        try:
+            with PDFIUM_LOCK:
+                total_pages = len(pdf)
+            for index in range(total_pages):
+                with PDFIUM_LOCK:
+                    page = pdf[index]
+                    textpage = page.get_textpage()
+                    try:
+                        # pdfium separates lines with CRLF
+                        text = textpage.get_text_range().replace("\r\n", "\n")
+                    finally:
+                        textpage.close()
+                        page.close()
+                pages_text.append(text)
+        finally:
+            with PDFIUM_LOCK:
+                pdf.close()
+
+        nonspace = 0
+        for text in pages_text:
+            nonspace += len("".join(text.split()))
+            if nonspace >= self.MIN_FAST_TEXT_CHARS:
+                break
+        if nonspace < self.MIN_FAST_TEXT_CHARS:
+            logger.info(f"pdfium found only {nonspace} chars, retrying with pdfminer.")
+            return None
+
+        logger.info(f"PDF extraction successful (pdfium). Extracted {len(pages_text)} pages.")
+        return ExtractionResult(
+            full_text="\n\n".join(pages_text),
+            pages=pages_text,
+            metadata={"method": "native_pdf", "engine": "pdfium", "page_count": len(pages_text)}
+        )
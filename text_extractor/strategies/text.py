@@ -1,67 +1,113 @@
 from .base import BaseExtractionStrategy, ExtractionResult
+from ..utils import BYTES_LIKE, stream_size
+from contextlib import contextmanager
+import codecs
+import io
+import mmap
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Checked in order: the UTF-32-LE mark starts with the UTF-16-LE one
+_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+
+def _detect_encoding(head: bytes) -> str:
+    """
+    Pick the codec for a text file from its first bytes.
+
+    A byte order mark selects UTF-8/16/32 (the codec strips the mark);
+    without one the file is read as UTF-8.
+    """
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    return 'utf-8'
+
+
+def _rewind(file_stream):
+    """Seek back to the start, unless the stream cannot seek (e.g. a pipe)."""
+    seekable = getattr(file_stream, 'seekable', None)
+    if hasattr(file_stream, 'seek') and (seekable is None or seekable()):
+        file_stream.seek(0)
+
+
+@contextmanager
+def _map_file(file_stream, size):
+    """
+    Yield a read-only mapping of the file behind `file_stream`, or None.
+
+    Decoding from the mapping reads straight from the page cache instead of
+    copying the file into a buffer first. Streams without a descriptor,
+    empty files and anything mmap refuses yield None.
+    """
+    try:
+        fd = file_stream.fileno() if size else None
+    except (AttributeError, OSError, ValueError):
+        fd = None
+    mapped = None
+    if isinstance(fd, int):
+        try:
+            mapped = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            pass
+    if mapped is None:
+        yield None
+        return
+    with mapped:
+        yield mapped
+
+
 class RawTextStrategy(BaseExtractionStrategy):
     """Extracts text from raw text files (.txt, .md, .csv, .json, .xml)."""
 
+    CHUNK_SIZE = 1024 * 1024  # 1MB reads for streams of unknown size
+    LARGE_FILE_BYTES = 500 * 1024 * 1024
+
     def extract(self, file_stream, language: str = 'eng') -> ExtractionResult:
         logger.info("Starting Raw Text extraction.")
         try:
-            # Ensure at start of stream
-            if hasattr(file_stream, 'seek'):
-                file_stream.seek(0)
-            
-            # Memory optimization: Read in chunks to handle very large text files
-            # For files > 100MB, this prevents loading everything into RAM at once
-            CHUNK_SIZE = 1024 * 1024  # 1MB chunks
-            text_chunks = []
-            total_size = 0
-            
-            try:
-                while True:
-                    chunk = file_stream.read(CHUNK_SIZE)
-                    if not chunk:
-                        break
-                    
-                    # Decode chunk
-                    try:
-                        decoded_chunk = chunk.decode('utf-8')
-                    except UnicodeDecodeError:
-                        # Fallback to latin-1 for this chunk
-                        logger.warning("UTF-8 decode failed for chunk, falling back to latin-1")
-                        decoded_chunk = chunk.decode('latin-1', errors='ignore')
-                    
-                    text_chunks.append(decoded_chunk)
-                    total_size += len(chunk)
-                    
-                    # Safety: Prevent accumulating too much in memory for extremely large files
-                    # If we've read >500MB, log a warning
-                    if total_size > 500 * 1024 * 1024:
-                        logger.warning(f"Large text file detected: {total_size / (1024*1024):.1f} MB processed")
-            
-            except AttributeError:
-                # file_stream might be bytes directly
-                if isinstance(file_stream, bytes):
-                    try:
-                        text = file_stream.decode('utf-8')
-                    except UnicodeDecodeError:
-                        logger.warning("UTF-8 decode failed, falling back to latin-1")
-                        text = file_stream.decode('latin-1')
-                    text_chunks = [text]
+            in_memory = isinstance(file_stream, BYTES_LIKE + (io.BytesIO, mmap.mmap))
+            size = None if in_memory else stream_size(file_stream)
+
+            with _map_file(file_stream, size) as mapped:
+                if mapped is None and not in_memory and (size is None or size > self.LARGE_FILE_BYTES):
+                    # Decode chunk by chunk so the whole file is never held as
+                    # bytes next to its decoded text. Streams of unknown size
+                    # (pipes, sockets) may be arbitrarily large, so they go
+                    # this way too.
+                    if size is not None:
+                        logger.warning(f"Large text file detected: {size / (1024*1024):.1f} MB processed")
+                    text = self._decode_chunks(file_stream)
                 else:
-                    raise
+                    # One-pass decode. A mapped file takes this path however
+                    # large: its bytes live in the page cache, not our heap,
+                    # so only the decoded text is allocated and there is no
+                    # chunk list to join
+                    raw = self._read_bytes(file_stream if mapped is None else mapped, size)
+                    try:
+                        # Safety: Flag extremely large files
+                        if len(raw) > self.LARGE_FILE_BYTES:
+                            logger.warning(f"Large text file detected: {len(raw) / (1024*1024):.1f} MB processed")
 
-            # Join all chunks
-            text = ''.join(text_chunks)
+                        text = self._decode(raw)
+                    finally:
+                        if isinstance(raw, memoryview):
+                            # Release the export so the mapping can be closed
+                            raw.release()
 
-            # Naive page splitting probably doesn't apply to text files, 
+            # Naive page splitting probably doesn't apply to text files,
             # but we can return the whole thing as one page.
             pages = [text]
 
             logger.info(f"Raw text extraction successful. Length: {len(text)} chars.")
-            
+
             return ExtractionResult(
                 full_text=text,
                 pages=pages,
@@ -71,3 +117,76 @@ class RawTextStrategy(BaseExtractionStrategy):
         except Exception as e:
             logger.error(f"Raw text extraction failed: {e}")
             raise Exception(f"Failed to extract text from file: {str(e)}")
+
+    @staticmethod
+    def _decode(raw) -> str:
+        """Decode raw bytes, replacing invalid sequences with U+FFFD."""
+        # Pure-ASCII content (the common case) skips UTF-8 validation entirely
+        if not isinstance(raw, memoryview) and raw.isascii():
+            return raw.decode('ascii')
+        # Single pass: a few stray bytes no longer throw away the UTF-8
+        # interpretation of the rest of the file
+        return str(raw, _detect_encoding(bytes(raw[:4])), 'replace')
+
+    def _decode_chunks(self, file_stream) -> str:
+        """Decode `file_stream` one chunk at a time."""
+        _rewind(file_stream)
+        chunk = file_stream.read(self.CHUNK_SIZE)
+        # The incremental decoder carries a multi-byte sequence split across
+        # a chunk boundary over to the next chunk instead of replacing it
+        decoder = codecs.getincrementaldecoder(_detect_encoding(chunk[:4]))(errors='replace')
+        parts = []
+        while chunk:
+            parts.append(decoder.decode(chunk))
+            chunk = file_stream.read(self.CHUNK_SIZE)
+        parts.append(decoder.decode(b'', final=True))
+        return ''.join(parts)
+
+    def _read_bytes(self, file_stream, size=None):
+        """
+        Return the full content of `file_stream` as a bytes-like object.
+
+        In-memory inputs are used as-is. Streams of known `size` are read
+        into a bytearray allocated once; others are accumulated into a
+        single growing bytearray rather than a list of chunks joined at the end.
+        """
+        if isinstance(file_stream, (bytes, bytearray)):
+            return file_stream
+        if isinstance(file_stream, memoryview):
+            # A view of our own: the caller's view must survive the release
+            # done after decoding
+            return memoryview(file_stream)
+
+        # Ensure at start of stream
+        _rewind(file_stream)
+
+        if isinstance(file_stream, io.BytesIO):
+            # getvalue() hands back the underlying buffer without a copy
+            return file_stream.getvalue()
+
+        if isinstance(file_stream, mmap.mmap):
+            # Decode straight from the mapped pages, no intermediate copy
+            return memoryview(file_stream)
+
+        buf = bytearray()
+        if size and hasattr(file_stream, 'readinto'):
+            # One exact allocation, filled in place, instead of repeated regrowth
+            buf = bytearray(size)
+            with memoryview(buf) as view:
+                offset = 0
+                while offset < size:
+                    n = file_stream.readinto(view[offset:])
+                    if not n:
+                        break
+                    offset += n
+            if offset < size:
+                # Stream was shorter than reported
+                del buf[offset:]
+            # Anything beyond the reported size (e.g. a growing file) is appended below
+
+        while True:
+            chunk = file_stream.read(self.CHUNK_SIZE)
+            if not chunk:
+                break
+            buf += chunk
+        return buf
@@ -0,0 +1,152 @@
+import io
+import mmap
+import os
+import stat
+import threading
+
+# In-memory payloads accepted anywhere a stream is
+BYTES_LIKE = (bytes, bytearray, memoryview)
+
+
+def ensure_stream(file_stream):
+    """
+    Return a seekable binary stream for `file_stream`.
+
+    Raw bytes are wrapped in a BytesIO only when a strategy actually needs
+    stream semantics; CPython's BytesIO shares a bytes object instead of
+    copying it (bytearray and memoryview payloads are copied). Anything
+    else is assumed to be a stream and returned as-is.
+    """
+    if isinstance(file_stream, BYTES_LIKE):
+        return io.BytesIO(file_stream)
+    return file_stream
+
+
+def stream_size(file_stream):
+    """
+    Return the total size of `file_stream` in bytes, or None if unknown.
+
+    In-memory buffers, mappings and regular files are sized without moving
+    the stream position. Only other seekable streams fall back to
+    seek-to-end/tell, and are left rewound to the start.
+    """
+    if isinstance(file_stream, (bytes, bytearray)):
+        return len(file_stream)
+    if isinstance(file_stream, memoryview):
+        return file_stream.nbytes
+    if isinstance(file_stream, io.BytesIO):
+        # Not getbuffer(): exporting a view un-shares (copies) a buffer
+        # BytesIO still shares with the bytes it was created from
+        pos = file_stream.tell()
+        size = file_stream.seek(0, 2)
+        file_stream.seek(pos)
+        return size
+    if isinstance(file_stream, mmap.mmap):
+        return len(file_stream)
+
+    try:
+        fd = file_stream.fileno()
+    except (AttributeError, OSError, ValueError):
+        # No usable descriptor (io.UnsupportedOperation is an OSError)
+        fd = None
+    if isinstance(fd, int):
+        st = os.fstat(fd)
+        # Pipes and sockets report st_size 0, which says nothing
+        if stat.S_ISREG(st.st_mode):
+            return st.st_size
+
+    seekable = getattr(file_stream, 'seekable', None)
+    if seekable is not None and not seekable():
+        return None
+    if hasattr(file_stream, 'seek') and hasattr(file_stream, 'tell'):
+        file_stream.seek(0, 2)
+        size = file_stream.tell()
+        file_stream.seek(0)
+        return size
+    return None
+
+
+# PDFium is not thread-safe, not even across separate documents: every
+# pdfium call in the process (open, page load, render, text, close) must
+# hold this lock. Reentrant so helpers can take it inside a held section.
+PDFIUM_LOCK = threading.RLock()
+
+# Streams up to this size are read into memory before pdfium opens them
+IN_MEMORY_PDF_BYTES = 64 * 1024 * 1024
+
+
+def open_pdf_document(file_stream):
+    """
+    Open `file_stream` as a pypdfium2 PdfDocument.
+
+    Bytes-like payloads, minimal readers and streams or mmaps of up to
+    IN_MEMORY_PDF_BYTES are loaded from memory, which pdfium reads
+    directly. Larger streams with readinto(), and larger mmaps, are read
+    lazily through callbacks as pdfium needs pages. Raises pypdfium2.PdfiumError if the
+    data is not a PDF.
+
+    Opening takes PDFIUM_LOCK; callers must hold it for every later call
+    on the document, including close().
+    """
+    with PDFIUM_LOCK:
+        return _open_pdf_document(file_stream)
+
+
+class _MappedReader(io.RawIOBase):
+    """
+    Read-only stream over an mmap for pdfium's lazy loader, which needs
+    readinto() (mmap has none) and seek() returning the new position (mmap's
+    returns None before Python 3.13). Reads copy one block at a time.
+    """
+
+    def __init__(self, mapping):
+        self._map = mapping
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._map)
+        self._pos = max(offset, 0)
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+    def readinto(self, buffer):
+        data = self._map[self._pos:self._pos + len(buffer)]
+        memoryview(buffer).cast('B')[:len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+
+def _open_pdf_document(file_stream):
+    import pypdfium2 as pdfium
+
+    if isinstance(file_stream, bytes):
+        return pdfium.PdfDocument(file_stream)
+    if isinstance(file_stream, (bytearray, memoryview)):
+        return pdfium.PdfDocument(bytes(file_stream))
+    if isinstance(file_stream, io.BytesIO):
+        # getvalue() shares the buffer rather than copying it
+        return pdfium.PdfDocument(file_stream.getvalue())
+    if isinstance(file_stream, mmap.mmap):
+        if len(file_stream) > IN_MEMORY_PDF_BYTES:
+            return pdfium.PdfDocument(_MappedReader(file_stream))
+        return pdfium.PdfDocument(file_stream[:])
+    if hasattr(file_stream, 'readinto'):
+        size = stream_size(file_stream)
+        if size is None or size > IN_MEMORY_PDF_BYTES:
+            return pdfium.PdfDocument(file_stream)
+        # One read up front instead of a Python callback per block pdfium
+        # fetches
+        file_stream.seek(0)
+        return pdfium.PdfDocument(file_stream.read())
+    return pdfium.PdfDocument(file_stream.read())